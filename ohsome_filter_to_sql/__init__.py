@@ -1,11 +1,67 @@
-from ohsome_filter_to_sql.main import (
-    OhsomeFilter,
-    ohsome_filter_to_sql,
-    validate_filter,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ohsome_filter_to_sql.dfa import dump_dfa, load_dfa
+    from ohsome_filter_to_sql.main import (
+        CompiledFilter,
+        Translator,
+        cache_clear,
+        cache_info,
+        compile_filter,
+        ohsome_filter_to_sql,
+        ohsome_filter_to_sql_many,
+        set_cache_size,
+        validate_filter,
+    )
+    from ohsome_filter_to_sql.parallel import ohsome_filter_to_sql_parallel
+    from ohsome_filter_to_sql.parsing import parse_info, parse_info_clear, warm_up
+    from ohsome_filter_to_sql.serialization import dump_filter, load_filter
+    from ohsome_filter_to_sql.validation import OhsomeFilter
 
 __all__ = (
+    "CompiledFilter",
     "OhsomeFilter",
+    "Translator",
+    "cache_clear",
+    "cache_info",
+    "compile_filter",
+    "dump_dfa",
+    "dump_filter",
+    "load_dfa",
+    "load_filter",
     "ohsome_filter_to_sql",
+    "ohsome_filter_to_sql_many",
+    "ohsome_filter_to_sql_parallel",
+    "parse_info",
+    "parse_info_clear",
+    "set_cache_size",
     "validate_filter",
+    "warm_up",
 )
+
+# Modules are imported on first access of one of their names. Importing the package
+# does not import the ANTLR runtime and pydantic, which the command line interface
+# does not need for valid arguments.
+MODULES = {
+    "OhsomeFilter": "validation",
+    "dump_dfa": "dfa",
+    "load_dfa": "dfa",
+    "dump_filter": "serialization",
+    "load_filter": "serialization",
+    "ohsome_filter_to_sql_parallel": "parallel",
+    "parse_info": "parsing",
+    "parse_info_clear": "parsing",
+    "warm_up": "parsing",
+}
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")  # noqa: TRY003
+    module = import_module("ohsome_filter_to_sql." + MODULES.get(name, "main"))
+    return getattr(module, name)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from threading import Lock
+from typing import Any, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache.
+
+    A `maxsize` of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        """Cached value of key. If key is not cached, value is cached and returned.
+
+        With value as key, equal values are shared as one object, like `sys.intern`
+        does for strings, but in a bounded table.
+        """
+        with self._lock:
+            try:
+                cached = self._data[key]
+            except KeyError:
+                self.misses += 1
+                if self.maxsize > 0:
+                    self._data[key] = value
+                    self._evict()
+                return value
+            self._data.move_to_end(key)
+            self.hits += 1
+            return cached
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.maxsize,
+                len(self._data),
+            )
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
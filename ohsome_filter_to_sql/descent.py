@@ -0,0 +1,393 @@
+"""Recursive descent parser for the ohsome filter language (OFL.g4).
+
+The parser follows the rules of OFL.g4 but decides each alternative with a fixed
+lookahead of a few tokens instead of running ANTLR's adaptive prediction. It feeds
+the same IR builder methods as the ANTLR listener `OFLToSql`.
+
+Input which is not accepted by this parser raises `DescentError`. The caller then
+falls back to the ANTLR parser, which is the reference implementation of the grammar
+and reports syntax errors. Clauses which are not translated to SQL are left to the
+ANTLR parser as well.
+"""
+
+from typing import Protocol
+
+from antlr4 import Token
+
+from ohsome_filter_to_sql.OFLParser import OFLParser
+
+# token types of the literals of OFL.g4 by their text, e.g. "=" or "and". Implicit
+# literals like '=' get generated names T__0, T__1, ... numbered by their position
+# in the grammar, so they are looked up by text instead.
+LITERALS: dict[str, int] = {
+    name.strip("'"): type_
+    for type_, name in enumerate(OFLParser.literalNames)
+    if name.startswith("'")
+}
+
+COLON = LITERALS[":"]
+EQ = LITERALS["="]
+NE = LITERALS["!="]
+PO = LITERALS["("]
+PC = LITERALS[")"]
+CO = LITERALS[","]
+DD = LITERALS[".."]
+TL = LITERALS["~"]
+AND = OFLParser.AND
+OR = OFLParser.OR
+NOT = OFLParser.NOT
+IN = OFLParser.IN
+WILDCARD = OFLParser.WILDCARD
+TYPE = OFLParser.TYPE
+ID = OFLParser.ID
+GEOMETRY = OFLParser.GEOMETRY
+AREA = OFLParser.AREA
+PERIMETER = OFLParser.PERIMETER
+LENGTH = OFLParser.LENGTH
+GEOMETRY_VERTICES = OFLParser.GEOMETRY_VERTICES
+GEOMETRY_OUTERS = OFLParser.GEOMETRY_OUTERS
+GEOMETRY_INNERS = OFLParser.GEOMETRY_INNERS
+CHANGESET = OFLParser.CHANGESET
+OSMTYPE = OFLParser.OSMTYPE
+OSMID = OFLParser.OSMID
+GEOMETRY_TYPE = OFLParser.GEOMETRY_TYPE
+NUMBER = OFLParser.NUMBER
+DECIMAL = OFLParser.DECIMAL
+WORD = OFLParser.WORD
+QUOTED = OFLParser.QUOTED
+WS = OFLParser.WS
+EOF = Token.EOF
+
+# tokens which can be part of an unquoted string (see rule string in OFL.g4)
+SEGMENTS = frozenset(
+    (
+        WORD,
+        AND,
+        OR,
+        NOT,
+        IN,
+        TYPE,
+        ID,
+        GEOMETRY,
+        AREA,
+        PERIMETER,
+        LENGTH,
+        GEOMETRY_VERTICES,
+        GEOMETRY_OUTERS,
+        GEOMETRY_INNERS,
+        CHANGESET,
+        OSMTYPE,
+        GEOMETRY_TYPE,
+    )
+)
+# tokens which follow a string of a tag match
+TAG_OPERATORS = frozenset((EQ, NE, IN, TL))
+# keywords of clauses which are not translated to SQL
+NOT_IMPLEMENTED = frozenset(
+    (PERIMETER, GEOMETRY_VERTICES, GEOMETRY_OUTERS, GEOMETRY_INNERS)
+)
+# keywords of clauses with a number, OSM ID, list or range as value
+KEYWORDS = frozenset((ID, AREA, LENGTH, CHANGESET)) | NOT_IMPLEMENTED
+
+
+class DescentError(Exception):
+    pass
+
+
+class Emitter(Protocol):
+    """IR builder methods of `OFLToSql` called by the parser."""
+
+    def string(self, texts: list[str]) -> str: ...
+    def parentheses(self): ...
+    def unary(self, operator: str): ...
+    def binary(self, operator: str): ...
+    def tag_match(self, key: str, value: str): ...
+    def tag_value_pattern_match(
+        self, key: str, value: str, prefix: bool, suffix: bool
+    ): ...
+    def tag_wildcard_match(self, key: str): ...
+    def tag_not_match(self, key: str, value: str): ...
+    def tag_not_wildcard_match(self, key: str): ...
+    def tag_list_match(self, key: str, values: list[str]): ...
+    def type_match(self, type_: str): ...
+    def id_match(self, id_: str): ...
+    def type_id_match(self, type_id: str): ...
+    def id_range_match(self, range_: str): ...
+    def id_list_match(self, ids: list[str]): ...
+    def type_id_list_match(self, type_ids: list[str]): ...
+    def geometry_match(self, geom_type: str): ...
+    def area_range_match(self, range_: str): ...
+    def length_range_match(self, range_: str): ...
+    def changeset_match(self, id_: str): ...
+    def changeset_list_match(self, ids: list[str]): ...
+    def changeset_range_match(self, range_: str): ...
+
+
+class OFLDescentParser[E: Emitter]:
+    def __init__(self, types: list[int], texts: list[str], emitter: E):
+        self.types: list[int] = [*types, EOF]
+        self.texts: list[str] = [*texts, "<EOF>"]
+        self.pos: int = 0
+        self.emitter = emitter
+
+    def parse(self) -> E:
+        """root: (expression | WILDCARD) EOF;"""
+        if self.types[0] == WILDCARD and self.types[1] == EOF:
+            return self.emitter
+        self.expression(0)
+        self.match(EOF)
+        return self.emitter
+
+    # --- helpers
+    #
+    def la(self, offset: int = 0) -> int:
+        return self.types[self.pos + offset]
+
+    def match(self, type_: int) -> str:
+        if self.types[self.pos] != type_:
+            raise DescentError()
+        text = self.texts[self.pos]
+        self.pos += 1
+        return text
+
+    def skip_ws(self):
+        if self.types[self.pos] == WS:
+            self.pos += 1
+
+    def at_operator(self, type_: int) -> bool:
+        """Whether the next tokens match a rule like `eq: WS? '=' WS?`."""
+        if self.types[self.pos] == WS:
+            return self.types[self.pos + 1] == type_
+        return self.types[self.pos] == type_
+
+    def operator(self, type_: int):
+        self.skip_ws()
+        self.match(type_)
+        self.skip_ws()
+
+    def next_after_ws(self, pos: int) -> int:
+        """Position of the next token which is not whitespace."""
+        return pos + 1 if self.types[pos] == WS else pos
+
+    # --- rules
+    #
+    def expression(self, precedence: int):
+        """Precedence climbing as generated by ANTLR for the left-recursive rule.
+
+        NOT binds tighter than AND, which binds tighter than OR. Both binary
+        operators are left-associative.
+        """
+        if self.at_operator(PO):
+            self.operator(PO)
+            self.expression(0)
+            self.operator(PC)
+            self.emitter.parentheses()
+        elif self.at_operator(NOT) and self.is_not_operator():
+            self.operator(NOT)
+            self.expression(27)
+            self.emitter.unary("NOT")
+        else:
+            self.clause()
+        while True:
+            if precedence <= 26 and self.at_operator(AND):
+                self.operator(AND)
+                self.expression(27)
+                self.emitter.binary("AND")
+            elif precedence <= 25 and self.at_operator(OR):
+                self.operator(OR)
+                self.expression(26)
+                self.emitter.binary("OR")
+            else:
+                return
+
+    def is_not_operator(self) -> bool:
+        """Tell `not natural=tree` apart from a tag with key `not`."""
+        pos = self.pos + 1 if self.la() == WS else self.pos
+        following = self.next_after_ws(pos + 1)
+        type_ = self.types[following]
+        if type_ == COLON and following == pos + 1:
+            return False  # not:foo=bar
+        if type_ in (EQ, NE, TL):
+            return False  # not=yes
+        if type_ == IN:
+            # not in (yes, no) or not in in (yes, no)
+            return self.types[self.next_after_ws(following + 1)] != PO
+        return True
+
+    def clause(self):
+        type_ = self.la()
+        if type_ in (TYPE, GEOMETRY) and self.type_or_geometry_clause():
+            return
+        if type_ in KEYWORDS and self.keyword_clause():
+            return
+        self.tag_clause()
+
+    def type_or_geometry_clause(self) -> bool:
+        keyword = self.la()
+        value = self.keyword_value()
+        if (
+            value is None
+            or self.types[value] != (OSMTYPE if keyword == TYPE else GEOMETRY_TYPE)
+            or self.continues_as_string(value)
+        ):
+            return False
+        self.pos = value + 1
+        if keyword == TYPE:
+            self.emitter.type_match(self.texts[value])
+        else:
+            self.emitter.geometry_match(self.texts[value])
+        return True
+
+    def keyword_clause(self) -> bool:
+        keyword = self.la()
+        value = self.keyword_value()
+        if value is None or self.types[value] not in (NUMBER, OSMID, PO):
+            return False
+        if keyword in NOT_IMPLEMENTED:
+            raise DescentError()
+        self.pos = value
+        if keyword == ID:
+            self.id_clause()
+        elif keyword == AREA:
+            self.emitter.area_range_match(self.bounds((NUMBER, DECIMAL)))
+        elif keyword == LENGTH:
+            self.emitter.length_range_match(self.bounds((NUMBER, DECIMAL)))
+        else:
+            self.changeset_clause()
+        return True
+
+    def keyword_value(self) -> int | None:
+        """Position after `KEYWORD cn` or None if no colon follows the keyword."""
+        pos = self.next_after_ws(self.pos + 1)
+        if self.types[pos] != COLON:
+            return None
+        return self.next_after_ws(pos + 1)
+
+    def continues_as_string(self, value: int) -> bool:
+        """Whether `type:node` is the start of a tag key like in `type:node=yes`."""
+        if self.types[self.pos + 1] != COLON or value != self.pos + 2:
+            return False  # whitespace is not allowed in a string
+        following = value + 1
+        if self.types[following] == COLON:
+            return True
+        return self.types[self.next_after_ws(following)] in TAG_OPERATORS
+
+    def tag_clause(self):
+        key = self.string()
+        if self.at_operator(EQ):
+            self.operator(EQ)
+            if self.la() == WILDCARD:
+                self.pos += 1
+                self.emitter.tag_wildcard_match(key)
+            else:
+                self.emitter.tag_match(key, self.string())
+        elif self.at_operator(NE):
+            self.operator(NE)
+            if self.la() == WILDCARD:
+                self.pos += 1
+                self.emitter.tag_not_wildcard_match(key)
+            else:
+                self.emitter.tag_not_match(key, self.string())
+        elif self.at_operator(IN):
+            self.operator(IN)
+            self.operator(PO)
+            values = [self.string()]
+            while self.at_operator(CO):
+                self.operator(CO)
+                values.append(self.string())
+            self.operator(PC)
+            self.emitter.tag_list_match(key, values)
+        elif self.at_operator(TL):
+            self.operator(TL)
+            prefix = self.la() == WILDCARD
+            if prefix:
+                self.pos += 1
+            value = self.string()
+            suffix = self.la() == WILDCARD
+            if suffix:
+                self.pos += 1
+            self.emitter.tag_value_pattern_match(key, value, prefix, suffix)
+        else:
+            raise DescentError()
+
+    def string(self) -> str:
+        type_ = self.la()
+        if type_ in (QUOTED, NUMBER):
+            return self.emitter.string([self.match(type_)])
+        if type_ not in SEGMENTS:
+            raise DescentError()
+        start = self.pos
+        self.pos += 1
+        while self.types[self.pos] == COLON:
+            self.pos += 1
+            if self.types[self.pos] in SEGMENTS and not self.at_list_match():
+                self.pos += 1
+        return self.emitter.string(self.texts[start : self.pos])
+
+    def at_list_match(self) -> bool:
+        """Whether `in (` follows like in `addr:in (1, 2)`."""
+        return self.la() == IN and self.types[self.next_after_ws(self.pos + 1)] == PO
+
+    def id_clause(self):
+        self.skip_ws()
+        type_ = self.la()
+        if type_ == NUMBER:
+            self.emitter.id_match(self.match(NUMBER))
+        elif type_ == OSMID:
+            self.emitter.type_id_match(self.match(OSMID))
+        elif self.is_list(NUMBER):
+            self.emitter.id_list_match(self.values(NUMBER))
+        elif self.is_list(OSMID):
+            self.emitter.type_id_list_match(self.values(OSMID))
+        else:
+            self.emitter.id_range_match(self.bounds((NUMBER,)))
+
+    def changeset_clause(self):
+        self.skip_ws()
+        if self.la() == NUMBER:
+            self.emitter.changeset_match(self.match(NUMBER))
+        elif self.is_list(NUMBER):
+            self.emitter.changeset_list_match(self.values(NUMBER))
+        else:
+            self.emitter.changeset_range_match(self.bounds((NUMBER,)))
+
+    def is_list(self, type_: int) -> bool:
+        """Whether a list like `(1, 2)` follows (and not a range like `(1..2)`)."""
+        if not self.at_operator(PO):
+            return False
+        pos = self.next_after_ws(self.next_after_ws(self.pos) + 1)
+        if self.types[pos] != type_:
+            return False
+        return self.types[self.next_after_ws(pos + 1)] in (CO, PC)
+
+    def values(self, type_: int) -> list[str]:
+        """po TYPE (co TYPE)* pc"""
+        self.operator(PO)
+        values = [self.match(type_)]
+        while self.at_operator(CO):
+            self.operator(CO)
+            values.append(self.match(type_))
+        self.operator(PC)
+        return values
+
+    def bounds(self, types: tuple[int, ...]) -> str:
+        """po (NUMBER dd NUMBER | dd NUMBER | NUMBER dd) pc
+
+        Returns the range without brackets like `range_int` and `range_dec` in
+        `OFLToSql`.
+        """
+        self.operator(PO)
+        start = self.pos
+        if self.la() in types:
+            self.pos += 1
+            self.operator(DD)
+            if self.la() in types:
+                self.pos += 1
+        else:
+            self.operator(DD)
+            if self.la() not in types:
+                raise DescentError()
+            self.pos += 1
+        stop = self.pos
+        self.operator(PC)
+        return "".join(self.texts[start:stop]).strip()
@@ -0,0 +1,122 @@
+"""Persist the DFA cache of the ANTLR parser and lexer.
+
+While parsing, ANTLR caches the result of its adaptive prediction in a DFA for each
+decision of the grammar. These DFAs are shared by all parsers of a process, but each
+new process starts with empty DFAs. `dump_dfa` writes the DFAs of a warmed up process
+(see `warm_up`) to a file and `load_dfa` loads them into another process.
+
+The file is a pickle and must therefore be trusted. It is only loaded if it was
+built from the same serialized ATNs and the same ANTLR runtime version.
+"""
+
+import hashlib
+import os
+import pickle
+import warnings
+from importlib.metadata import version
+from pathlib import Path
+
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.ATNState import ATNState
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.SemanticContext import SemanticContext
+from antlr4.PredictionContext import PredictionContext
+
+from ohsome_filter_to_sql.OFLLexer import OFLLexer
+from ohsome_filter_to_sql.OFLLexer import (
+    serializedATN as serialized_lexer_atn,  # noqa: N813
+)
+from ohsome_filter_to_sql.OFLParser import OFLParser
+from ohsome_filter_to_sql.OFLParser import (
+    serializedATN as serialized_parser_atn,  # noqa: N813
+)
+
+ATNS = {
+    "lexer": OFLLexer.atn,
+    "parser": OFLParser.atn,
+}
+
+# The ATN states are part of the grammar and are not pickled but referenced by
+# number. The runtime compares these singletons by identity.
+SINGLETONS = {
+    "empty context": PredictionContext.EMPTY,
+    "no semantic context": SemanticContext.NONE,
+    "parser error state": ATNSimulator.ERROR,
+    "lexer error state": LexerATNSimulator.ERROR,
+}
+
+
+class DFAPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if isinstance(obj, ATNState):
+            atn = "parser" if obj.atn is ATNS["parser"] else "lexer"
+            return ("state", atn, obj.stateNumber)
+        for name, singleton in SINGLETONS.items():
+            if obj is singleton:
+                return (name,)
+        return None
+
+
+class DFAUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        if pid[0] == "state":
+            return ATNS[pid[1]].states[pid[2]]
+        return SINGLETONS[pid[0]]
+
+
+def dfa_version() -> str:
+    """Hash of the serialized ATNs and the version of the ANTLR runtime."""
+    hash_ = hashlib.sha256(version("antlr4-python3-runtime").encode())
+    for serialized_atn in (serialized_lexer_atn(), serialized_parser_atn()):
+        hash_.update(",".join(map(str, serialized_atn)).encode())
+    return hash_.hexdigest()
+
+
+def dump_dfa(path: str | Path):
+    """Write the DFAs of parser and lexer to a file."""
+    with open(path, "wb") as file:
+        pickle.dump(dfa_version(), file)
+        DFAPickler(file).dump(
+            (
+                OFLLexer.decisionsToDFA,
+                OFLParser.decisionsToDFA,
+                OFLParser.sharedContextCache.cache,
+            )
+        )
+
+
+def load_dfa(path: str | Path) -> bool:
+    """Replace the DFAs of parser and lexer by the DFAs written to a file.
+
+    Returns:
+        Whether the DFAs have been loaded. DFAs built from another grammar or ANTLR
+        runtime version are not loaded.
+    """
+    with open(path, "rb") as file:
+        if pickle.load(file) != dfa_version():  # noqa: S301
+            return False
+        lexer_dfas, parser_dfas, context_cache = DFAUnpickler(file).load()
+    for dfa in lexer_dfas + parser_dfas:
+        # hash codes of DFA states depend on the identity of SemanticContext.NONE
+        states = list(dfa.states)
+        for state in states:
+            state.configs.cachedHashCode = -1
+        dfa._states = {state: state for state in states}
+    OFLLexer.decisionsToDFA[:] = lexer_dfas
+    OFLParser.decisionsToDFA[:] = parser_dfas
+    OFLParser.sharedContextCache.cache = context_cache
+    return True
+
+
+if dfa_cache := os.environ.get("OHSOME_FILTER_TO_SQL_DFA_CACHE"):
+    # The cache only saves the warm-up. Parsing starts with empty DFAs if it cannot
+    # be loaded.
+    try:
+        if not load_dfa(dfa_cache):
+            warnings.warn(
+                f"DFA cache {dfa_cache} was built for another grammar or ANTLR "
+                "runtime version and is not loaded",
+                stacklevel=2,
+            )
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError) as error:
+        warnings.warn(f"DFA cache {dfa_cache} is not loaded: {error}", stacklevel=2)
@@ -0,0 +1,29 @@
+class ParserValueError(ValueError):
+    pass
+
+
+class LexerValueError(ValueError):
+    pass
+
+
+class InvalidRangeError(ValueError):
+    def __init__(self, lower_bound, upper_bound):
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        super().__init__(
+            "Upper bound is smaller the then lower bound. "
+            f"Try swapping bounds: ({lower_bound}..{upper_bound})"
+        )
+
+    def __reduce__(self):
+        # args holds the message only, which does not match the signature
+        return (InvalidRangeError, (self.lower_bound, self.upper_bound))
+
+
+class UnsupportedClauseError(ValueError):
+    def __init__(self, clause: str):
+        self.clause = clause
+        super().__init__(f"Clause is not supported yet: {clause}")
+
+    def __reduce__(self):
+        return (UnsupportedClauseError, (self.clause,))
@@ -0,0 +1,283 @@
+"""Intermediate representation (IR) of a translated ohsome filter.
+
+Both parsers build the IR with the methods of `OFLToSql`. The SQL WHERE clause is
+emitted by a pass over it (see `sql`). Nodes are immutable and compared by value.
+
+Chains of AND or OR are flattened into a single node with all operands, so that
+a chain of n terms is one level deep instead of n levels.
+
+Bounds of ranges are not checked until SQL is emitted, so that errors are raised in
+the same order as if SQL was emitted while walking the parse tree.
+"""
+
+from dataclasses import dataclass
+from typing import Any, ClassVar
+from weakref import WeakValueDictionary
+
+
+class Node:
+    """Base of the IR nodes, which are compared by value.
+
+    The hash of a node is computed once. Nodes are hash-consed by `intern`: equal
+    nodes built by the parsers are the same object, so that filters share their
+    common subexpressions and equal subexpressions are found by identity.
+    """
+
+    __slots__ = ("__weakref__", "_hash")
+    # names of the fields of a node, set by dataclass
+    __match_args__: ClassVar[tuple[str, ...]] = ()
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__match_args__)
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            hash_ = hash((type(self), *self._values()))
+            object.__setattr__(self, "_hash", hash_)
+            return hash_
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Node):
+            return NotImplemented
+        if type(other) is not type(self) or hash(self) != hash(other):
+            return False
+        # children are compared by identity first, which is all it takes if shared
+        return self._values() == other._values()
+
+
+# Weak values: a node is dropped from the table once no filter references it.
+_nodes: WeakValueDictionary[tuple, Any] = WeakValueDictionary()
+
+
+def intern[T: Node](node: T) -> T:
+    """Shared node equal to the given node, whose children are shared already.
+
+    Nodes are interned bottom-up while the IR is built, so that each node is
+    looked up by its own values and the cached hashes of its children.
+    """
+    return _nodes.setdefault((type(node), *node._values()), node)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TagEq(Node):
+    """key=value"""
+
+    key: str
+    value: str
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TagNe(Node):
+    """key!=value"""
+
+    key: str
+    value: str
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TagExists(Node):
+    """key=*"""
+
+    key: str
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TagNotExists(Node):
+    """key!=*"""
+
+    key: str
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TagIn(Node):
+    """key in (value, value)"""
+
+    key: str
+    values: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TagLike(Node):
+    """key~*value*"""
+
+    key: str
+    value: str
+    prefix: bool
+    suffix: bool
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TypeEq(Node):
+    """type:way"""
+
+    type_: str
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class IdEq(Node):
+    """id:1"""
+
+    id_: int
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TypeIdEq(Node):
+    """id:way/1"""
+
+    type_: str
+    id_: int
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class IdIn(Node):
+    """id:(1, 2)"""
+
+    ids: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TypeIdIn(Node):
+    """id:(way/1, node/2)"""
+
+    type_ids: tuple[tuple[str, int], ...]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class IdRange(Node):
+    """id:(1..2)"""
+
+    lower: int | None
+    upper: int | None
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class GeomType(Node):
+    """geometry:polygon"""
+
+    geom_type: str
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class AreaRange(Node):
+    """area:(1.5..2)"""
+
+    lower: float | None
+    upper: float | None
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class LengthRange(Node):
+    """length:(1.5..2)"""
+
+    lower: float | None
+    upper: float | None
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ChangesetEq(Node):
+    """changeset:1"""
+
+    id_: int
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ChangesetIn(Node):
+    """changeset:(1, 2)"""
+
+    ids: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ChangesetRange(Node):
+    """changeset:(1..2)"""
+
+    lower: int | None
+    upper: int | None
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Verbatim(Node):
+    """Text of a clause without translation, which is emitted as it is."""
+
+    text: str
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Unsupported(Node):
+    """Clause which is not translated yet, like geometry.vertices:(1..2)."""
+
+    text: str
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Group(Node):
+    """(expression)"""
+
+    expression: "Expression"
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Not(Node):
+    """not expression"""
+
+    expression: "Expression"
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class And(Node):
+    """expression and expression and ..."""
+
+    operands: tuple["Expression", ...]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Or(Node):
+    """expression or expression or ..."""
+
+    operands: tuple["Expression", ...]
+
+
+type Expression = (
+    TagEq
+    | TagNe
+    | TagExists
+    | TagNotExists
+    | TagIn
+    | TagLike
+    | TypeEq
+    | IdEq
+    | TypeIdEq
+    | IdIn
+    | TypeIdIn
+    | IdRange
+    | GeomType
+    | AreaRange
+    | LengthRange
+    | ChangesetEq
+    | ChangesetIn
+    | ChangesetRange
+    | Verbatim
+    | Unsupported
+    | Group
+    | Not
+    | And
+    | Or
+)
+
+
+def int_bounds(range_: str) -> tuple[int | None, int | None]:
+    lower_bound, upper_bound = [
+        int(n.strip()) if n else None for n in range_.split("..")
+    ]
+    return (lower_bound, upper_bound)
+
+
+def float_bounds(range_: str) -> tuple[float | None, float | None]:
+    lower_bound, upper_bound = [
+        float(n.strip()) if n else None for n in range_.split("..")
+    ]
+    return (lower_bound, upper_bound)
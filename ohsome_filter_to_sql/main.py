@@ -1,409 +1,378 @@
-import json
+import re
 import sys
-from collections import deque
-from typing import Annotated
-
-from antlr4 import CommonTokenStream, InputStream, ParserRuleContext, ParseTreeWalker
-from antlr4.error.ErrorListener import ErrorListener
-from pydantic import AfterValidator, Field, validate_call
-from typing_extensions import TypeAliasType
-
-from ohsome_filter_to_sql.OFLLexer import OFLLexer
-from ohsome_filter_to_sql.OFLListener import OFLListener
-from ohsome_filter_to_sql.OFLParser import OFLParser
+from collections.abc import Iterable
+from functools import cached_property
+from importlib import import_module
+from threading import local
+from typing import TYPE_CHECKING, Literal
+
+from ohsome_filter_to_sql import ir
+from ohsome_filter_to_sql.cache import CacheInfo, LRUCache
+from ohsome_filter_to_sql.errors import (
+    InvalidRangeError,  # noqa: F401 part of the interface of this module
+    LexerValueError,  # noqa: F401 part of the interface of this module
+    ParserValueError,  # noqa: F401 part of the interface of this module
+    UnsupportedClauseError,  # noqa: F401 part of the interface of this module
+)
+from ohsome_filter_to_sql.sql import to_sql
+
+if TYPE_CHECKING:
+    # names of other modules which are imported on first access, see `LAZY`
+    from ohsome_filter_to_sql.parsing import (  # noqa: F401
+        Chain,
+        OFLLexerErrorListener,
+        OFLParserErrorListener,
+        OFLToSql,
+        ParseInfo,
+        RecursionLimit,
+        TreeBuilder,
+        build_tree,
+        descend,
+        handlers,
+        parse_info,
+        parse_info_clear,
+        recursion_limit,
+        unescape,
+        walk_tree,
+        warm_up,
+    )
+    from ohsome_filter_to_sql.validation import OhsomeFilter  # noqa: F401
+
+
+class CompiledFilter(str):
+    """Ohsome filter which has been parsed and translated already.
+
+    Returned by `validate_filter` and therefore the value of an `OhsomeFilter`.
+    `ohsome_filter_to_sql` returns its translation without parsing it again.
+    The expressions of the intermediate representation (see `ir`) are kept as well.
+    """
 
+    query: str
+    query_args: tuple[str | int | float | tuple, ...]
+    expressions: tuple[ir.Expression, ...]
+
+    def __new__(
+        cls,
+        filter_: str,
+        query: str,
+        query_args: tuple,
+        expressions: tuple[ir.Expression, ...] = (),
+    ):
+        compiled = super().__new__(cls, filter_)
+        compiled.query = query
+        compiled.query_args = query_args
+        compiled.expressions = expressions
+        return compiled
+
+    @classmethod
+    def from_expressions(
+        cls, filter_: str, expressions: tuple[ir.Expression, ...]
+    ) -> "CompiledFilter":
+        """Compiled filter with the SQL translated from the expressions of the IR."""
+        if filter_ == "*":
+            return cls(filter_, "1=1", tuple())
+        query, query_args = to_sql(expressions)
+        return cls(filter_, query, query_args, expressions)
+
+    def __reduce__(self):
+        return (
+            CompiledFilter,
+            (str(self), self.query, self.query_args, self.expressions),
+        )
 
-class ParserValueError(ValueError):
-    pass
+    def to_sql(self, args_shift: int = 0) -> tuple[str, tuple]:
+        """SQL WHERE clause and query arguments, see `ohsome_filter_to_sql`."""
+        if args_shift == 0:
+            return (self.query, self.query_args)
+        query = PLACEHOLDER.sub(lambda m: f"${int(m[1]) + args_shift}", self.query)
+        return (query, self.query_args)
 
 
-class LexerValueError(ValueError):
-    pass
+# Query arguments are the only part of a query which starts with $.
+PLACEHOLDER = re.compile(r"\$(\d+)")
 
+# parsers of ohsome_filter_to_sql, see its engine argument
+Engine = Literal["antlr", "descent"]
+ENGINES: tuple[Engine, ...] = ("antlr", "descent")
 
-class InvalidRangeError(ValueError):
-    def __init__(self, lower_bound, upper_bound):
-        super().__init__(
-            "Upper bound is smaller the then lower bound. "
-            f"Try swapping bounds: ({lower_bound}..{upper_bound})"
-        )
 
+def is_valid(filter_: object, args_shift: object) -> bool:
+    """Whether arguments pass validation as they are, checked without pydantic.
 
-class OFLParserErrorListener(ErrorListener):
-    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
-        # message is based on antlr4 ConsoleErrorListener
-        raise ParserValueError("line " + str(line) + ":" + str(column) + " " + msg)
+    Arguments of other types are left to pydantic (see `validation`), which converts
+    them or raises a `ValidationError`.
+    """
+    return (
+        type(filter_) in (str, CompiledFilter)
+        and filter_ != ""
+        and type(args_shift) is int
+        and args_shift >= 0
+    )
 
 
-class OFLLexerErrorListener(ErrorListener):
-    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
-        raise LexerValueError("line " + str(line) + ":" + str(column) + " " + msg)
+class ThreadState(local):
+    """Tree builder and listener of a thread, created on first use in the thread."""
 
+    def __init__(self, lexer: Literal["scanner", "antlr"]):
+        self.lexer = lexer
 
-class OFLToSql(OFLListener):
-    def __init__(self, args_shift: int = 0):
-        self.stack: deque[str] = deque()
-        self.args: deque[str | int | float | tuple] = deque()
-        self.args_shift: int = args_shift
+    @cached_property
+    def builder(self) -> "TreeBuilder":
+        from ohsome_filter_to_sql.parsing import TreeBuilder
 
-    @property
-    def args_len(self) -> int:
-        return len(self.args) + self.args_shift
+        return TreeBuilder(self.lexer)
 
-    def exitString(self, ctx: ParserRuleContext):
-        if ctx.getChildCount() == 1:
-            self.stack.append(unescape(ctx.getChild(0).getText()))
-        else:
-            result = ""
-            for child in ctx.getChildren():
-                result += child.getText()
-            self.stack.append(result)
-
-    def exitRange_int(self, ctx):
-        """Remove range brackets."""
-        self.stack.append(ctx.getText().strip()[1:-1].strip())
-
-    def exitRange_dec(self, ctx):
-        """Remove range brackets."""
-        self.stack.append(ctx.getText().strip()[1:-1].strip())
-
-    # --- methods are sorted in the same order as rules in OFL.g4
-    #
-    def exitExpression(self, ctx: ParserRuleContext):
-        """Handle expression compositions: (), NOT, AND, OR"""
-        if ctx.getChildCount() == 3:
-            if (
-                ctx.getChild(0).getText().strip() == "("
-                and ctx.getChild(2).getText().strip() == ")"
-            ):
-                expression = self.stack.pop()
-                self.stack.append("(" + expression + ")")
-            else:
-                right = self.stack.pop()
-                left = self.stack.pop()
-                operator = ctx.getChild(1).getText().strip().upper()  # AND, OR
-                self.stack.append(f"{left} {operator} {right}")
-        elif ctx.getChildCount() == 2:
-            operator = ctx.getChild(0).getText().strip().upper()  # NOT
-            self.stack.append(f"{operator} {self.stack.pop()}")
-
-    # ---
-    #
-    def exitTagMatch(self, ctx: ParserRuleContext):
-        value = self.stack.pop()
-        key = self.stack.pop()
-        j = json.dumps({key: value})
-        # @> Does the first JSON value contain the second?
-        self.args.append(j)
-        self.stack.append(f"tags @> ${self.args_len}")
-
-    def exitTagValuePatternMatch(self, ctx):
-        value = (
-            self.stack.pop().replace("%", "\\%").replace("_", "\\_").replace("'", "''")
-        )
-        key = self.stack.pop().replace("'", "''")
+    @cached_property
+    def listener(self) -> "OFLToSql":
+        from ohsome_filter_to_sql.parsing import OFLToSql
 
-        value_child = ctx.getChild(2)
-        if value_child.getChild(0).getText() == "*":
-            value = "%" + value
+        return OFLToSql()
 
-        if value_child.getChild(value_child.getChildCount() - 1).getText() == "*":
-            value = value + "%"
 
-        self.args.append(key)
-        self.args.append(value)
-        self.stack.append(
-            f"((tags->>${self.args_len - 1}) IS NOT NULL "
-            f"AND (tags->>${self.args_len - 1}) LIKE ${self.args_len})"
-        )
+class Translator:
+    """Translate ohsome filters into SQL WHERE clauses for ohsome DB.
 
-    def exitTagWildcardMatch(self, ctx: ParserRuleContext):
-        key = self.stack.pop()
-        self.args.append(key)
-        self.stack.append(f"tags ? ${self.args_len}")
-
-    def exitTagNotMatch(self, ctx: ParserRuleContext):
-        value = self.stack.pop()
-        key = self.stack.pop()
-        j = json.dumps({key: value})
-        self.args.append(j)
-        self.stack.append(f"NOT tags @> ${self.args_len}")
-
-    def exitTagNotWildcardMatch(self, ctx: ParserRuleContext):
-        key = self.stack.pop()
-        self.args.append(key)
-        self.stack.append(f"NOT tags ? ${self.args_len}")
-
-    def exitTagListMatch(self, ctx: ParserRuleContext):
-        values = []
-        children = [child.getText() for child in ctx.getChildren()]
-        # skip first part denoting "key in (" as well as last part closing list with ")"
-        # and skip commas in list in between brackets
-        for child in children[3:-1:2]:
-            # remove STRING from stack wich are part of *ListMatch
-            self.stack.pop()
-            values.append('"' + unescape(child) + '"')
-        key = self.stack.pop()
-        self.args.append(key)
-        self.args.append(tuple(values))
-        self.stack.append(
-            f"((tags->${self.args_len - 1}) IS NOT NULL "
-            f"AND (tags->${self.args_len - 1}) = ANY(${self.args_len}))"
-        )
+    A translator owns its configuration and its translation cache. Each thread
+    using the translator gets its own lexer, token stream, parser and listener,
+    which are reused for all filters translated by that thread.
 
-    # ---
-    #
-    def exitTypeMatch(self, ctx: ParserRuleContext):
-        type_ = ctx.getChild(2).getText()  # NODE, WAY, RELATION
-        self.args.append(type_)
-        self.stack.append(f"osm_type = ${self.args_len}")
-
-    def exitIdMatch(self, ctx: ParserRuleContext):
-        id_ = ctx.getChild(2).getText()
-        self.args.append(int(id_))
-        self.stack.append(f"osm_id = ${self.args_len}")
-
-    def exitTypeIdMatch(self, ctx: ParserRuleContext):
-        type_, id_ = ctx.getChild(2).getText().split("/")
-        self.args.append(type_)
-        self.args.append(int(id_))
-        self.stack.append(
-            f"(osm_type = ${self.args_len - 1} AND osm_id = ${self.args_len})"
-        )
+    Args:
+        engine: Parser to use. See `ohsome_filter_to_sql`.
+        lexer: Token source of the ANTLR parser. See `TreeBuilder`.
+        cache: Translation cache. A cache of 1024 translations by default.
+        parse_tree: Whether the ANTLR parser builds a parse tree, which is walked
+            afterwards. By default filters are translated while they are parsed.
+            See `TreeBuilder.translate`.
+    """
 
-    def exitIdRangeMatch(self, ctx: ParserRuleContext):
-        range_ = self.stack.pop()
-        lower_bound, upper_bound = [
-            int(n.strip()) if n else None for n in range_.split("..")
-        ]
-        if lower_bound and upper_bound:
-            if lower_bound > upper_bound:
-                raise InvalidRangeError(upper_bound, lower_bound)
-            self.args.append(lower_bound)
-            self.args.append(upper_bound)
-            self.stack.append(
-                f"(osm_id >= ${self.args_len - 1} AND osm_id <= ${self.args_len})"
-            )
-        elif lower_bound:
-            self.args.append(lower_bound)
-            self.stack.append(f"osm_id >= ${self.args_len}")
-        elif upper_bound:
-            self.args.append(upper_bound)
-            self.stack.append(f"osm_id <= ${self.args_len}")
-
-    def exitIdListMatch(self, ctx: ParserRuleContext):
-        # differs from TagListMatch insofar that no STRING needs to be popped from stack
-        values = []
-        children = [child.getText() for child in ctx.getChildren()]
-        # skip first part denoting "id:(" as well as last part closing list with ")"
-        # and skip commas in list in between brackets
-        values = list(children[3:-1:2])
-        self.args.append(tuple([int(v) for v in values]))
-        self.stack.append(f"osm_id = ANY(${self.args_len})")
-
-    def exitTypeIdListMatch(self, ctx: ParserRuleContext):
-        values = []
-        children = [child.getText() for child in ctx.getChildren()]
-        # skip first part denoting "id:(" as well as last part closing list with ")"
-        # and skip commas in list in between brackets
-        for child in children[3:-1:2]:
-            type_, id_ = child.split("/")
-            self.args.append(int(id_))
-            self.args.append(type_)
-            values.append(
-                f"(osm_id = ${self.args_len - 1} AND osm_type = ${self.args_len})"
-            )
-        if len(values) > 1:
-            self.stack.append("(" + " OR ".join(values) + ")")
+    def __init__(
+        self,
+        engine: Engine = "antlr",
+        lexer: Literal["scanner", "antlr"] = "scanner",
+        cache: LRUCache | None = None,
+        parse_tree: bool = False,
+    ):
+        self.engine = engine
+        self.parse_tree = parse_tree
+        # Translations are immutable (query string and a tuple of str, int, float or
+        # tuples thereof) and can therefore be handed out from the cache as they are.
+        self.cache = LRUCache(maxsize=1024) if cache is None else cache
+        self._state = ThreadState(lexer)
+
+    def compile(self, filter_: str) -> CompiledFilter:
+        """Parse and translate ohsome filter."""
+        if filter_ == "*":
+            return CompiledFilter.from_expressions(filter_, ())
+        # imports the ANTLR runtime on the first translation
+        from ohsome_filter_to_sql.parsing import descend, walk_tree
+        from ohsome_filter_to_sql.trivial import translate_trivial
+
+        builder = self._state.builder
+        listener = self._state.listener
+        listener.reset()
+        if translate_trivial(filter_, listener):
+            pass  # translated without a parser
+        elif self.engine == "descent":
+            descend(filter_, listener, builder)
+        elif self.parse_tree:
+            walk_tree(builder.build_tree(filter_), listener)
         else:
-            self.stack.append(" OR ".join(values))
-
-    # ---
-    #
-    def exitGeometryMatch(self, ctx: ParserRuleContext):
-        geom_type = ctx.getChild(2).getText()
-        match geom_type:
-            case "point":
-                self.stack.append("(status_geom_type).geom_type = 'Point'")
-            case "line":
-                self.stack.append("(status_geom_type).geom_type = 'LineString'")
-            case "polygon":
-                self.stack.append(
-                    "((status_geom_type).geom_type = 'Polygon' "
-                    + "OR (status_geom_type).geom_type = 'MultiPolygon')"
-                )
-            case "collection":
-                self.stack.append("(status_geom_type).geom_type = 'GeometryCollection'")
-
-    def exitAreaRangeMatch(self, ctx: ParserRuleContext):
-        range_ = self.stack.pop()
-        lower_bound, upper_bound = [
-            float(n.strip()) if n else None for n in range_.split("..")
-        ]
-        if lower_bound and upper_bound:
-            if lower_bound > upper_bound:
-                raise InvalidRangeError(upper_bound, lower_bound)
-            self.args.append(lower_bound)
-            self.args.append(upper_bound)
-            self.stack.append(
-                f"(area >= ${self.args_len - 1} AND area <= ${self.args_len})"
-            )
-        elif lower_bound:
-            self.args.append(lower_bound)
-            self.stack.append(f"area >= ${self.args_len}")
-        elif upper_bound:
-            self.args.append(upper_bound)
-            self.stack.append(f"area <= ${self.args_len}")
-
-    def exitLengthRangeMatch(self, ctx: ParserRuleContext):
-        range_ = self.stack.pop()
-        lower_bound, upper_bound = [
-            float(n.strip()) if n else None for n in range_.split("..")
-        ]
-        if lower_bound and upper_bound:
-            if lower_bound > upper_bound:
-                raise InvalidRangeError(upper_bound, lower_bound)
-            self.args.append(lower_bound)
-            self.args.append(upper_bound)
-            self.stack.append(
-                f"(length >= ${self.args_len - 1} AND length <= ${self.args_len})"
+            builder.translate(filter_, listener)
+        return CompiledFilter.from_expressions(filter_, listener.expressions())
+
+    def translate(
+        self, filter_: str, args_shift: int = 0
+    ) -> tuple[str, tuple[str | int | float | tuple, ...]]:
+        """Translate ohsome filter. See `ohsome_filter_to_sql`."""
+        if not is_valid(filter_, args_shift):
+            from ohsome_filter_to_sql import validation
+
+            filter_, args_shift, _ = validation.ohsome_filter_to_sql(
+                filter_, args_shift
             )
-        elif lower_bound:
-            self.args.append(lower_bound)
-            self.stack.append(f"length >= ${self.args_len}")
-        elif upper_bound:
-            self.args.append(upper_bound)
-            self.stack.append(f"length <= ${self.args_len}")
-
-    def exitGeometryVerticesRangeMatch(self, ctx: ParserRuleContext):
-        # TODO
-        raise NotImplementedError()
-
-    def exitGeometryOutersMatch(self, ctx: ParserRuleContext):
-        # TODO
-        raise NotImplementedError()
-
-    def exitGeometryOutersRangeMatch(self, ctx: ParserRuleContext):
-        # TODO
-        raise NotImplementedError()
-
-    def exitGeometryInnersMatch(self, ctx: ParserRuleContext):
-        # TODO
-        raise NotImplementedError()
-
-    def exitGeometryInnersRangeMatch(self, ctx: ParserRuleContext):
-        # TODO
-        raise NotImplementedError()
-
-    # ---
-    #
-    def exitChangesetMatch(self, ctx: ParserRuleContext):
-        id_ = int(ctx.getChild(2).getText())
-        self.args.append(id_)
-        self.stack.append(f"changeset_id = ${self.args_len}")
-
-    def exitChangesetListMatch(self, ctx: ParserRuleContext):
-        children = [child.getText() for child in ctx.getChildren()]
-        # skip first part denoting "id:(" as well as last part closing list with ")"
-        # and skip commas in list in between brackets
-        self.args.append(tuple([int(i) for i in children[3:-1:2]]))
-        self.stack.append(f"changeset_id = ANY(${self.args_len})")
-
-    def exitChangesetRangeMatch(self, ctx: ParserRuleContext):
-        range_ = self.stack.pop()
-        lower_bound, upper_bound = [
-            int(n.strip()) if n else None for n in range_.split("..")
-        ]
-        if lower_bound and upper_bound:
-            self.args.append(lower_bound)
-            self.args.append(upper_bound)
-            self.stack.append(
-                f"(changeset_id >= ${self.args_len - 1} "
-                f"AND changeset_id <= ${self.args_len})"
-            )
-        elif lower_bound:
-            self.args.append(lower_bound)
-            self.stack.append(f"changeset_id >= ${self.args_len}")
-        elif upper_bound:
-            self.args.append(upper_bound)
-            self.stack.append(f"changeset_id <= ${self.args_len}")
-
-
-def unescape(string: str):
-    if string[0] == '"':
-        string = string[1:-1]
-        # fmt: off
-        string = string.replace("\\\"", "\"") # noqa: Q003
-        # fmt: on
-        string = string.replace("\\\\", "\\")
-        string = string.replace("\\\r", "\r")
-        string = string.replace("\\\n", "\n")
-    return string
-
-
-def validate_filter(filter_: str) -> str:
-    listener = OFLToSql()
-    tree = build_tree(filter_)
-    walk_tree(tree, listener)
-    return filter_
-
-
-@validate_call
+        return self._translate(filter_, args_shift)
+
+    def _translate(
+        self, filter_: str, args_shift: int
+    ) -> tuple[str, tuple[str | int | float | tuple, ...]]:
+        if isinstance(filter_, CompiledFilter):
+            return filter_.to_sql(args_shift)
+        if filter_ == "*":
+            return ("1=1", tuple())
+        key = (filter_, args_shift)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self.compile(filter_).to_sql(args_shift)
+        self.cache.put(key, result)
+        return result
+
+    def translate_many(
+        self, filters: Iterable[str], args_shift: int = 0
+    ) -> list[tuple[str, tuple[str | int | float | tuple, ...]] | Exception]:
+        """Translate many ohsome filters. See `ohsome_filter_to_sql_many`."""
+        if type(args_shift) is not int or args_shift < 0:
+            from ohsome_filter_to_sql import validation
+
+            args_shift, _ = validation.ohsome_filter_to_sql_many(args_shift)
+        return self._translate_many(filters, args_shift)
+
+    def _translate_many(
+        self, filters: Iterable[str], args_shift: int
+    ) -> list[tuple[str, tuple[str | int | float | tuple, ...]] | Exception]:
+        results = []
+        for filter_ in filters:
+            try:
+                if not is_valid(filter_, args_shift):
+                    # e.g. None or "", which raise a ValidationError
+                    from ohsome_filter_to_sql import validation
+
+                    filter_, _, _ = validation.ohsome_filter_to_sql(filter_)
+                if isinstance(filter_, CompiledFilter):
+                    compiled = filter_
+                else:
+                    compiled = self.compile(filter_)
+                results.append(compiled.to_sql(args_shift))
+            except Exception as error:
+                # any error fails only its own filter, not the rest of the batch
+                results.append(error)
+        return results
+
+
+def compile_filter(
+    filter_: str,
+    engine: Engine = "antlr",
+) -> CompiledFilter:
+    """Parse and translate ohsome filter. See `ohsome_filter_to_sql`."""
+    if type(filter_) is not str or filter_ == "" or engine not in ENGINES:
+        from ohsome_filter_to_sql import validation
+
+        filter_, engine = validation.compile_filter(filter_, engine)
+    return _translators[engine].compile(filter_)
+
+
+def validate_filter(filter_: str) -> CompiledFilter:
+    if isinstance(filter_, CompiledFilter):
+        return filter_
+    return compile_filter(filter_)
+
+
 def ohsome_filter_to_sql(
-    filter_: Annotated[str, Field(min_length=1)],
-    args_shift: Annotated[int, Field(ge=0, default=0)] = 0,
+    filter_: str,
+    args_shift: int = 0,
+    engine: Engine = "antlr",
 ) -> tuple[str, tuple[str | int | float | tuple, ...]]:
     """Translate ohsome filter into a SQL WHERE clause for ohsome DB.
 
     Args:
-        filter_: Ohsome filter
+        filter_: Ohsome filter. The translation of a `CompiledFilter`, e.g. of a
+            validated `OhsomeFilter`, is reused.
         args_shift: Integer by which to shift numbered query arguments: $n + arg_shift
+        engine: Parser to use. "antlr" runs the parser generated from OFL.g4.
+            "descent" runs a hand-written recursive descent parser, which is faster
+            and falls back to the ANTLR parser if it does not accept the filter.
 
     Returns:
         The SQL WHERE clause in native PostgreSQL syntax for query arguments: $n.
         The query arguments.
     """
-    if filter_ == "*":
-        return ("1=1", tuple())
-    listener = OFLToSql(args_shift)
-    tree = build_tree(filter_)
-    result = walk_tree(tree, listener)
-    query = " ".join(result.stack)
-    query_args = tuple(result.args)
-    return (query, query_args)
+    if not is_valid(filter_, args_shift) or engine not in ENGINES:
+        from ohsome_filter_to_sql import validation
 
+        filter_, args_shift, engine = validation.ohsome_filter_to_sql(
+            filter_, args_shift, engine
+        )
+    return _translators[engine]._translate(filter_, args_shift)
 
-def cli():
-    print(ohsome_filter_to_sql(input()))
 
+def ohsome_filter_to_sql_many(
+    filters: Iterable[str],
+    args_shift: int = 0,
+    engine: Engine = "antlr",
+) -> list[tuple[str, tuple[str | int | float | tuple, ...]] | Exception]:
+    """Translate many ohsome filters into SQL WHERE clauses for ohsome DB.
+
+    Lexer, token stream and parser are reused for all filters. Translations are
+    neither looked up in nor added to the cache.
 
-def build_tree(filter_: str) -> ParserRuleContext:
-    """Build a antlr4 parse tree.
+    Args:
+        filters: Ohsome filters
+        args_shift: Integer by which to shift numbered query arguments: $n + arg_shift
+        engine: Parser to use. See `ohsome_filter_to_sql`.
 
-    https://github.com/antlr/antlr4/blob/master/doc/listeners.md
+    Returns:
+        For each filter the SQL WHERE clause and the query arguments, or the error
+        raised for the filter.
     """
-    input_stream = InputStream(filter_)
-    lexer = OFLLexer(input_stream)
-    lexer.removeErrorListeners()
-    lexer.addErrorListener(OFLLexerErrorListener())
-    stream = CommonTokenStream(lexer)
-    parser = OFLParser(stream)
-    parser.removeErrorListeners()
-    parser.addErrorListener(OFLParserErrorListener())
-    tree = parser.root()
-    return tree
-
-
-def walk_tree(tree: ParserRuleContext, listener: OFLToSql) -> OFLToSql:
-    walker = ParseTreeWalker()
-    walker.walk(listener, tree)
-    return listener
-
-
-OhsomeFilter = TypeAliasType(
-    "OhsomeFilter",
-    Annotated[str, AfterValidator(validate_filter)],
-)
+    if type(args_shift) is not int or args_shift < 0 or engine not in ENGINES:
+        from ohsome_filter_to_sql import validation
+
+        args_shift, engine = validation.ohsome_filter_to_sql_many(args_shift, engine)
+    return _translators[engine]._translate_many(filters, args_shift)
+
+
+def cache_info() -> CacheInfo:
+    """Hits, misses, evictions, maximum and current size of the translation cache."""
+    return _cache.info()
+
+
+def cache_clear():
+    """Remove all translations from the cache and reset its statistics."""
+    _cache.clear()
+
+
+def set_cache_size(maxsize: int):
+    """Set the maximum number of cached translations.
+
+    Least recently used translations are evicted first. A size of 0 disables caching.
+    """
+    if type(maxsize) is not int or maxsize < 0:
+        from ohsome_filter_to_sql import validation
+
+        maxsize = validation.set_cache_size(maxsize)
+    _cache.resize(maxsize)
+
+
+def cli():
+    print(ohsome_filter_to_sql(input()))
+
+
+# default translators of the module functions, which share one cache
+_cache = LRUCache(maxsize=1024)
+_translators = {
+    "antlr": Translator("antlr", cache=_cache),
+    "descent": Translator("descent", cache=_cache),
+}
+
+
+# Names of other modules which are part of the interface of this module. They are
+# imported on first access: `parsing` imports the ANTLR runtime and `validation`
+# imports pydantic, which the command line interface does not need.
+LAZY = {
+    "Chain": "parsing",
+    "OFLLexerErrorListener": "parsing",
+    "OFLParserErrorListener": "parsing",
+    "OFLToSql": "parsing",
+    "OhsomeFilter": "validation",
+    "ParseInfo": "parsing",
+    "RecursionLimit": "parsing",
+    "TreeBuilder": "parsing",
+    "build_tree": "parsing",
+    "descend": "parsing",
+    "handlers": "parsing",
+    "parse_info": "parsing",
+    "parse_info_clear": "parsing",
+    "recursion_limit": "parsing",
+    "unescape": "parsing",
+    "walk_tree": "parsing",
+    "warm_up": "parsing",
+}
+
+
+def __getattr__(name: str):
+    if name not in LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")  # noqa: TRY003
+    return getattr(import_module("ohsome_filter_to_sql." + LAZY[name]), name)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+"""Translate many ohsome filters in parallel.
+
+Translation is pure Python and holds the GIL, so threads do not speed up a batch.
+`ohsome_filter_to_sql_parallel` sends chunks of filters to worker processes or, on
+Python 3.14 and later, to subinterpreters, which each have their own GIL.
+
+Each worker loads the DFAs of the ANTLR parser and lexer once when it starts (see
+`dump_dfa`) and keeps building on them for all chunks it translates.
+
+Workers import this module to run `init_worker` and `translate_chunk`. It does not
+import pydantic, which cannot be loaded in subinterpreters. Arguments are validated
+with pydantic in the calling interpreter only if they are not of the expected types
+(see `validation`).
+"""
+
+import concurrent.futures
+import os
+import tempfile
+from collections.abc import Iterable
+from functools import partial
+from itertools import batched, chain
+from pathlib import Path
+from typing import Literal
+
+from ohsome_filter_to_sql.dfa import dump_dfa, load_dfa
+from ohsome_filter_to_sql.main import ENGINES, Engine, ohsome_filter_to_sql_many
+
+POOLS = ("process", "interpreter")
+
+
+def init_worker(dfa_cache: str | Path):
+    load_dfa(dfa_cache)
+
+
+def translate_chunk(
+    filters: tuple[str, ...],
+    args_shift: int,
+    engine: Engine,
+) -> list[tuple[str, tuple[str | int | float | tuple, ...]] | Exception]:
+    return ohsome_filter_to_sql_many(filters, args_shift, engine)
+
+
+def executor_class(pool: Literal["process", "interpreter"]) -> type:
+    if pool == "process":
+        return concurrent.futures.ProcessPoolExecutor
+    if not hasattr(concurrent.futures, "InterpreterPoolExecutor"):
+        raise NotImplementedError("Subinterpreter pools require Python 3.14.")
+    return concurrent.futures.InterpreterPoolExecutor
+
+
+def is_valid(
+    args_shift: object,
+    engine: object,
+    pool: object,
+    max_workers: object,
+    chunksize: object,
+    dfa_cache: object,
+) -> bool:
+    """Whether arguments pass validation as they are, checked without pydantic."""
+    return (
+        type(args_shift) is int
+        and args_shift >= 0
+        and engine in ENGINES
+        and pool in POOLS
+        and (max_workers is None or (type(max_workers) is int and max_workers >= 1))
+        and type(chunksize) is int
+        and chunksize >= 1
+        and (dfa_cache is None or isinstance(dfa_cache, (str, Path)))
+    )
+
+
+def ohsome_filter_to_sql_parallel(
+    filters: Iterable[str],
+    args_shift: int = 0,
+    engine: Engine = "antlr",
+    pool: Literal["process", "interpreter"] = "process",
+    max_workers: int | None = None,
+    chunksize: int = 256,
+    dfa_cache: str | Path | None = None,
+) -> list[tuple[str, tuple[str | int | float | tuple, ...]] | Exception]:
+    """Translate many ohsome filters in parallel into SQL WHERE clauses.
+
+    Results are returned in the order of the filters, like by
+    `ohsome_filter_to_sql_many`. Translations are neither looked up in nor added
+    to the cache.
+
+    Args:
+        filters: Ohsome filters
+        args_shift: Integer by which to shift numbered query arguments: $n + arg_shift
+        engine: Parser to use. See `ohsome_filter_to_sql`.
+        pool: Run workers as processes or as subinterpreters (Python 3.14).
+        max_workers: Number of workers. The number of usable CPUs by default.
+        chunksize: Number of filters sent to a worker at once.
+        dfa_cache: DFA file loaded by each worker (see `dump_dfa`). By default the
+            DFAs of the calling process are passed on.
+
+    Returns:
+        For each filter the SQL WHERE clause and the query arguments, or the error
+        raised for an invalid filter.
+    """
+    if not is_valid(args_shift, engine, pool, max_workers, chunksize, dfa_cache):
+        from ohsome_filter_to_sql import validation
+
+        args_shift, engine, pool, max_workers, chunksize, dfa_cache = (
+            validation.ohsome_filter_to_sql_parallel(
+                args_shift, engine, pool, max_workers, chunksize, dfa_cache
+            )
+        )
+    executor = executor_class(pool)
+    chunks = batched(filters, chunksize, strict=False)
+    with tempfile.TemporaryDirectory() as directory:
+        if dfa_cache is None:
+            dfa_cache = os.path.join(directory, "dfa.pickle")
+            dump_dfa(dfa_cache)
+        with executor(
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(str(dfa_cache),),
+        ) as workers:
+            translate = partial(translate_chunk, args_shift=args_shift, engine=engine)
+            results = workers.map(translate, chunks)
+            return list(chain.from_iterable(results))
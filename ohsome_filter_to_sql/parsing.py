@@ -0,0 +1,676 @@
+"""Translation of ohsome filters by the ANTLR parser and the recursive descent parser.
+
+`OFLToSql` builds the intermediate representation (see `ir`) while the parser
+generated from OFL.g4 parses a filter or while its parse tree is walked. This
+module imports the ANTLR runtime and the generated parser. `main` imports it on the
+first translation only, so that importing `main` and starting the command line
+interface does not load them.
+"""
+
+import os
+import sys
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager, suppress
+from functools import cache
+from threading import Lock
+from typing import TYPE_CHECKING, Literal, NamedTuple, cast
+
+from antlr4 import (
+    CommonTokenStream,
+    InputStream,
+    Lexer,
+    ParserRuleContext,
+    PredictionMode,
+    Token,
+)
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.Errors import ParseCancellationException
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.tree.Tree import TerminalNode
+
+from ohsome_filter_to_sql import ir
+from ohsome_filter_to_sql.cache import LRUCache
+from ohsome_filter_to_sql.descent import DescentError, OFLDescentParser
+from ohsome_filter_to_sql.errors import LexerValueError, ParserValueError
+from ohsome_filter_to_sql.OFLListener import OFLListener
+from ohsome_filter_to_sql.OFLParser import OFLParser
+from ohsome_filter_to_sql.scanner import OFLScanner
+
+if TYPE_CHECKING:
+    from ohsome_filter_to_sql.OFLLexer import OFLLexer
+
+if os.environ.get("OHSOME_FILTER_TO_SQL_DFA_CACHE"):
+    # loads the DFA cache at import
+    import ohsome_filter_to_sql.dfa  # noqa: F401
+
+
+class OFLParserErrorListener(ErrorListener):
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        # message is based on antlr4 ConsoleErrorListener
+        raise ParserValueError("line " + str(line) + ":" + str(column) + " " + msg)
+
+
+class OFLLexerErrorListener(ErrorListener):
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        raise LexerValueError("line " + str(line) + ":" + str(column) + " " + msg)
+
+
+# tag keys and values shared by all translations
+_strings = LRUCache(maxsize=65_536)
+
+
+class Chain:
+    """Operands of a chain of AND or OR which may be extended by further operands.
+
+    The IR is immutable. Operands are collected in a list until the chain is part
+    of another expression, which takes it as `ir.And` or `ir.Or`.
+    """
+
+    __slots__ = ("operands", "operator")
+
+    def __init__(self, operator: str, operands: list[ir.Expression]):
+        self.operator = operator
+        self.operands = operands
+
+    def expression(self) -> ir.Expression:
+        if self.operator == "AND":
+            return ir.intern(ir.And(tuple(self.operands)))
+        return ir.intern(ir.Or(tuple(self.operands)))
+
+
+class OFLToSql(OFLListener):
+    """Translate a parse tree into the intermediate representation (see `ir`).
+
+    The exit methods collect the values of a rule from the ANTLR parse tree. The
+    snake_case methods build the IR and are shared with `OFLDescentParser`. SQL is
+    emitted from the IR by `to_sql`.
+
+    The listener is notified by walking a parse tree or by the parser itself while
+    it parses (see `TreeBuilder.translate`). The parser then does not add the
+    contexts of subrules to their rule, which holds its own tokens only. Therefore
+    values are read from the tokens of a rule, and the operator of an expression is
+    recorded when its subrule is left.
+    """
+
+    def __init__(self):
+        self.stack: deque[str | Chain | ir.Expression] = deque()
+        # operator of each expression which has been entered but not left yet
+        self.operators: list[str | None] = []
+        # stack size on entering each tag list which has not been left yet
+        self.marks: list[int] = []
+        # wildcards before and after the value of the last tagValuePatternMatch
+        self.pattern: tuple[bool, bool] = (False, False)
+
+    def reset(self):
+        """Clear stack to translate another filter."""
+        self.stack.clear()
+        self.operators.clear()
+        self.marks.clear()
+
+    def expressions(self) -> tuple[ir.Expression, ...]:
+        """Expressions of the translated filter."""
+        return tuple(self.pop_all())
+
+    def pop_all(self) -> list[ir.Expression]:
+        return [self.expression(item) for item in self.stack]
+
+    def expression(self, item: "str | Chain | ir.Expression") -> ir.Expression:
+        if isinstance(item, Chain):
+            return item.expression()
+        # the range of clauses without translation is left on the stack as text
+        return ir.intern(ir.Verbatim(item)) if isinstance(item, str) else item
+
+    def pop_string(self) -> str:
+        """Pop a tag key or value or the text of a range, pushed as str."""
+        return cast(str, self.stack.pop())
+
+    def push(self, node: ir.Expression):
+        """Push node shared with equal nodes of other filters, see `ir.intern`."""
+        self.stack.append(ir.intern(node))
+
+    def exitString(self, ctx: ParserRuleContext):
+        self.stack.append(self.string([child.getText() for child in ctx.getChildren()]))
+
+    def string(self, texts: list[str]) -> str:
+        string = unescape(texts[0]) if len(texts) == 1 else "".join(texts)
+        # the same string object for all tag keys and values which are equal
+        return _strings.setdefault(string, string)
+
+    def text(self, ctx: ParserRuleContext) -> str:
+        """Text of all tokens of a rule, like `getText` of a parse tree."""
+        # set by the contexts of the generated parser, which ParserRuleContext lacks
+        parser: OFLParser = ctx.parser  # ty: ignore[unresolved-attribute]
+        tokens = parser.getTokenStream().tokens
+        # indexes are set by the token stream
+        start = cast(int, self.first(ctx).tokenIndex)
+        stop = cast(int, self.last(ctx).tokenIndex)
+        return "".join(t.text for t in tokens[start : stop + 1])
+
+    def first(self, ctx: ParserRuleContext) -> Token:
+        """First token of a rule, which is set once the rule has been left."""
+        return cast(Token, ctx.start)
+
+    def last(self, ctx: ParserRuleContext) -> Token:
+        """Last token of a rule, which is set once the rule has been left."""
+        return cast(Token, ctx.stop)
+
+    def tokens(self, ctx: ParserRuleContext) -> list[str]:
+        """Text of the tokens of a rule which are not part of a subrule."""
+        return [
+            child.getText()
+            for child in ctx.getChildren()
+            if isinstance(child, TerminalNode)
+        ]
+
+    def exitRange_int(self, ctx):
+        """Remove range brackets."""
+        self.stack.append(self.text(ctx).strip()[1:-1].strip())
+
+    def exitRange_dec(self, ctx):
+        """Remove range brackets."""
+        self.stack.append(self.text(ctx).strip()[1:-1].strip())
+
+    # --- methods are sorted in the same order as rules in OFL.g4
+    #
+    def enterExpression(self, ctx: ParserRuleContext):
+        self.operators.append(None)
+
+    def exitExpression(self, ctx: ParserRuleContext):
+        """Handle expression compositions: (), NOT, AND, OR"""
+        match self.operators.pop():
+            case "(":
+                self.parentheses()
+            case "NOT":
+                self.unary("NOT")
+            case "AND" | "OR" as operator:
+                self.binary(operator)
+
+    def exitPo(self, ctx: ParserRuleContext):
+        # not the opening bracket of a list or range
+        if isinstance(ctx.parentCtx, OFLParser.ExpressionContext):
+            self.operators[-1] = "("
+
+    def exitNot(self, ctx: ParserRuleContext):
+        self.operators[-1] = "NOT"
+
+    def exitAnd(self, ctx: ParserRuleContext):
+        self.operators[-1] = "AND"
+
+    def exitOr(self, ctx: ParserRuleContext):
+        self.operators[-1] = "OR"
+
+    def parentheses(self):
+        self.push(ir.Group(self.expression(self.stack.pop())))
+
+    def unary(self, operator: str):
+        self.push(ir.Not(self.expression(self.stack.pop())))
+
+    def binary(self, operator: str):
+        right = self.expression(self.stack.pop())
+        left = self.stack.pop()
+        # operators are left-associative: a chain of the same operator is extended
+        if isinstance(left, Chain) and left.operator == operator:
+            left.operands.append(right)
+            self.stack.append(left)
+        else:
+            self.stack.append(Chain(operator, [self.expression(left), right]))
+
+    # ---
+    #
+    def exitTagMatch(self, ctx: ParserRuleContext):
+        value = self.pop_string()
+        key = self.pop_string()
+        self.tag_match(key, value)
+
+    def tag_match(self, key: str, value: str):
+        self.push(ir.TagEq(key, value))
+
+    def exitValueSubString(self, ctx: ParserRuleContext):
+        self.pattern = (
+            self.first(ctx).type == OFLParser.WILDCARD,
+            self.last(ctx).type == OFLParser.WILDCARD,
+        )
+
+    def exitTagValuePatternMatch(self, ctx):
+        value = self.pop_string()
+        key = self.pop_string()
+        prefix, suffix = self.pattern
+        self.tag_value_pattern_match(key, value, prefix=prefix, suffix=suffix)
+
+    def tag_value_pattern_match(self, key: str, value: str, prefix: bool, suffix: bool):
+        self.push(ir.TagLike(key, value, prefix, suffix))
+
+    def exitTagWildcardMatch(self, ctx: ParserRuleContext):
+        self.tag_wildcard_match(self.pop_string())
+
+    def tag_wildcard_match(self, key: str):
+        self.push(ir.TagExists(key))
+
+    def exitTagNotMatch(self, ctx: ParserRuleContext):
+        value = self.pop_string()
+        key = self.pop_string()
+        self.tag_not_match(key, value)
+
+    def tag_not_match(self, key: str, value: str):
+        self.push(ir.TagNe(key, value))
+
+    def exitTagNotWildcardMatch(self, ctx: ParserRuleContext):
+        self.tag_not_wildcard_match(self.pop_string())
+
+    def tag_not_wildcard_match(self, key: str):
+        self.push(ir.TagNotExists(key))
+
+    def enterTagListMatch(self, ctx: ParserRuleContext):
+        self.marks.append(len(self.stack))
+
+    def exitTagListMatch(self, ctx: ParserRuleContext):
+        # the key and the values have been pushed on the stack by exitString
+        start = self.marks.pop() + 1
+        values = [self.pop_string() for _ in range(len(self.stack) - start)]
+        values.reverse()
+        key = self.pop_string()
+        self.tag_list_match(key, values)
+
+    def tag_list_match(self, key: str, values: list[str]):
+        self.push(ir.TagIn(key, tuple(values)))
+
+    # ---
+    #
+    def exitTypeMatch(self, ctx: ParserRuleContext):
+        self.type_match(self.last(ctx).text)  # NODE, WAY, RELATION
+
+    def type_match(self, type_: str):
+        self.push(ir.TypeEq(type_))
+
+    def exitIdMatch(self, ctx: ParserRuleContext):
+        self.id_match(self.last(ctx).text)
+
+    def id_match(self, id_: str):
+        self.push(ir.IdEq(int(id_)))
+
+    def exitTypeIdMatch(self, ctx: ParserRuleContext):
+        self.type_id_match(self.last(ctx).text)
+
+    def type_id_match(self, type_id: str):
+        type_, id_ = type_id.split("/")
+        self.push(ir.TypeIdEq(type_, int(id_)))
+
+    def exitIdRangeMatch(self, ctx: ParserRuleContext):
+        self.id_range_match(self.pop_string())
+
+    def id_range_match(self, range_: str):
+        self.push(ir.IdRange(*ir.int_bounds(range_)))
+
+    def exitIdListMatch(self, ctx: ParserRuleContext):
+        # differs from TagListMatch insofar that no STRING needs to be popped from stack
+        # skip first token "id", brackets and commas are tokens of subrules
+        self.id_list_match(self.tokens(ctx)[1:])
+
+    def id_list_match(self, ids: list[str]):
+        self.push(ir.IdIn(tuple([int(v) for v in ids])))
+
+    def exitTypeIdListMatch(self, ctx: ParserRuleContext):
+        # skip first token "id", brackets and commas are tokens of subrules
+        self.type_id_list_match(self.tokens(ctx)[1:])
+
+    def type_id_list_match(self, type_ids: list[str]):
+        values = []
+        for type_id in type_ids:
+            type_, id_ = type_id.split("/")
+            values.append((type_, int(id_)))
+        self.push(ir.TypeIdIn(tuple(values)))
+
+    # ---
+    #
+    def exitGeometryMatch(self, ctx: ParserRuleContext):
+        self.geometry_match(self.last(ctx).text)
+
+    def geometry_match(self, geom_type: str):
+        self.push(ir.GeomType(geom_type))
+
+    def exitAreaRangeMatch(self, ctx: ParserRuleContext):
+        self.area_range_match(self.pop_string())
+
+    def area_range_match(self, range_: str):
+        self.push(ir.AreaRange(*ir.float_bounds(range_)))
+
+    def exitLengthRangeMatch(self, ctx: ParserRuleContext):
+        self.length_range_match(self.pop_string())
+
+    def length_range_match(self, range_: str):
+        self.push(ir.LengthRange(*ir.float_bounds(range_)))
+
+    def exitGeometryVerticesRangeMatch(self, ctx: ParserRuleContext):
+        self.unsupported(ctx, has_range=True)
+
+    def exitGeometryOutersMatch(self, ctx: ParserRuleContext):
+        self.unsupported(ctx)
+
+    def exitGeometryOutersRangeMatch(self, ctx: ParserRuleContext):
+        self.unsupported(ctx, has_range=True)
+
+    def exitGeometryInnersMatch(self, ctx: ParserRuleContext):
+        self.unsupported(ctx)
+
+    def exitGeometryInnersRangeMatch(self, ctx: ParserRuleContext):
+        self.unsupported(ctx, has_range=True)
+
+    def unsupported(self, ctx: ParserRuleContext, has_range: bool = False):
+        """Raises UnsupportedClauseError once SQL is emitted, see `ir.Unsupported`."""
+        if has_range:
+            self.stack.pop()
+        self.push(ir.Unsupported(self.text(ctx)))
+
+    # ---
+    #
+    def exitChangesetMatch(self, ctx: ParserRuleContext):
+        self.changeset_match(self.last(ctx).text)
+
+    def changeset_match(self, id_: str):
+        self.push(ir.ChangesetEq(int(id_)))
+
+    def exitChangesetListMatch(self, ctx: ParserRuleContext):
+        # skip first token "changeset", brackets and commas are tokens of subrules
+        self.changeset_list_match(self.tokens(ctx)[1:])
+
+    def changeset_list_match(self, ids: list[str]):
+        self.push(ir.ChangesetIn(tuple([int(i) for i in ids])))
+
+    def exitChangesetRangeMatch(self, ctx: ParserRuleContext):
+        self.changeset_range_match(self.pop_string())
+
+    def changeset_range_match(self, range_: str):
+        self.push(ir.ChangesetRange(*ir.int_bounds(range_)))
+
+
+def unescape(string: str):
+    if string[0] == '"':
+        string = string[1:-1]
+        # fmt: off
+        string = string.replace("\\\"", "\"") # noqa: Q003
+        # fmt: on
+        string = string.replace("\\\\", "\\")
+        string = string.replace("\\\r", "\r")
+        string = string.replace("\\\n", "\n")
+    return string
+
+
+class ParseInfo(NamedTuple):
+    sll: int
+    ll: int
+
+
+_parse_counts: dict[str, int] = {"sll": 0, "ll": 0}
+_parse_counts_lock = Lock()
+
+
+class RecursionLimit:
+    """Raise the recursion limit while parsing deeply nested filters.
+
+    Both parsers recurse once per level of parentheses or NOT. Each level takes at
+    least one character, so the length of a filter bounds its depth. The limit is
+    raised by the length of long filters and restored after the last of them has
+    been parsed. The limit is shared by all threads.
+    """
+
+    # depth which is left to the parsers by the default limit of 1000
+    threshold: int = 500
+
+    def __init__(self):
+        self.lock = Lock()
+        self.active: int = 0
+        self.original: int = 0
+
+    @contextmanager
+    def __call__(self, filter_: str) -> Generator[None]:
+        if len(filter_) < self.threshold:
+            yield
+            return
+        with self.lock:
+            if self.active == 0:
+                self.original = sys.getrecursionlimit()
+            self.active += 1
+            limit = self.original + len(filter_)
+            sys.setrecursionlimit(max(limit, sys.getrecursionlimit()))
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.active -= 1
+                if self.active == 0:
+                    sys.setrecursionlimit(self.original)
+
+
+recursion_limit = RecursionLimit()
+
+
+def build_tree(
+    filter_: str,
+    lexer: Literal["scanner", "antlr"] = "scanner",
+) -> ParserRuleContext:
+    """Build a antlr4 parse tree.
+
+    See `TreeBuilder`, which can be reused for many filters.
+
+    https://github.com/antlr/antlr4/blob/master/doc/listeners.md
+    """
+    return TreeBuilder(lexer).build_tree(filter_)
+
+
+class TreeBuilder:
+    """Build antlr4 parse trees with the same lexer, token stream and parser.
+
+    The filter is parsed with the faster SLL prediction mode first, which bails out
+    on the first error. Only if that fails, the filter is parsed again with full LL
+    prediction, which reports syntax errors. See `parse_info`.
+
+    Tokens are produced by `OFLScanner` or, if lexer is "antlr", by the lexer
+    generated from OFL.g4. Both produce the same tokens and errors. The generated
+    lexer, which deserializes its ATN at import, is only imported if it is used.
+
+    A tree builder must not be used by more than one thread at a time.
+    """
+
+    def __init__(self, lexer: Literal["scanner", "antlr"] = "scanner"):
+        self.lexer = lexer
+        self.token_source: "OFLLexer | OFLScanner"
+        if lexer == "antlr":
+            from ohsome_filter_to_sql.OFLLexer import OFLLexer
+
+            self.token_source = OFLLexer(None)
+            self.token_source.removeErrorListeners()
+            self.token_source.addErrorListener(OFLLexerErrorListener())
+        else:
+            self.token_source = OFLScanner("", OFLLexerErrorListener())
+        # OFLScanner implements the methods of Lexer which are used by the stream
+        self.stream = CommonTokenStream(cast(Lexer, self.token_source))
+        self.parser = OFLParser(self.stream)
+        self.parser.removeErrorListeners()
+        self.error_listener = OFLParserErrorListener()
+        self.bail_error_strategy = BailErrorStrategy()
+        self.default_error_strategy = DefaultErrorStrategy()
+
+    def build_tree(self, filter_: str) -> ParserRuleContext:
+        try:
+            tree = self.parse(filter_, PredictionMode.SLL)
+        except (ParseCancellationException, LexerValueError):
+            # the LL parse decides whether a syntax or a lexer error is raised first
+            _count_parse("ll")
+            return self.parse(filter_, PredictionMode.LL)
+        _count_parse("sll")
+        return tree
+
+    def translate(self, filter_: str, listener: OFLToSql) -> OFLToSql:
+        """Translate filter while it is parsed, without building a parse tree.
+
+        The listener is notified by the parser (see `OFLToSql`), which releases the
+        context of a rule once it has been left. The parse tree is neither kept in
+        memory nor walked a second time.
+
+        Like `build_tree`, the filter is parsed in SLL mode first. If that fails, a
+        parse tree is built in LL mode, which reports syntax errors, and walked.
+        """
+        try:
+            self.parse(filter_, PredictionMode.SLL, listener)
+        except Exception as error:
+            # Rules left by the exception are passed to the listener as well, which
+            # can fail on their incomplete contexts. Other errors are raised.
+            if not _parse_failed(error):
+                raise
+            listener.reset()
+        else:
+            _count_parse("sll")
+            return listener
+        finally:
+            self.parser.removeParseListeners()
+            self.parser.buildParseTrees = True
+        _count_parse("ll")
+        return walk_tree(self.parse(filter_, PredictionMode.LL), listener)
+
+    def parse(
+        self,
+        filter_: str,
+        prediction_mode: PredictionMode,
+        listener: OFLToSql | None = None,
+    ) -> ParserRuleContext:
+        if isinstance(self.token_source, OFLScanner):
+            self.token_source.reset(filter_)
+        else:
+            self.token_source.inputStream = InputStream(filter_)
+        # resets the stream; its parameter is annotated with a placeholder of None
+        self.stream.setTokenSource(self.token_source)  # ty: ignore[invalid-argument-type]
+        parser = self.parser
+        parser.removeErrorListeners()
+        if prediction_mode == PredictionMode.SLL:
+            parser._errHandler = self.bail_error_strategy
+        else:
+            parser._errHandler = self.default_error_strategy
+            parser.addErrorListener(self.error_listener)
+        parser.setTokenStream(self.stream)
+        if listener is not None:
+            # added after setTokenStream, which fails with parse listeners
+            parser.buildParseTrees = False
+            parser.addParseListener(listener)
+        cast(ParserATNSimulator, parser._interp).predictionMode = prediction_mode
+        with recursion_limit(filter_):
+            tree = parser.root()
+        return tree
+
+
+def _parse_failed(error: BaseException | None) -> bool:
+    """Whether error is an SLL syntax or a lexer error or raised while handling one."""
+    while error is not None:
+        if isinstance(error, (ParseCancellationException, LexerValueError)):
+            return True
+        error = error.__context__
+    return False
+
+
+def _count_parse(mode: str):
+    with _parse_counts_lock:
+        _parse_counts[mode] += 1
+
+
+def parse_info() -> ParseInfo:
+    """Number of filters parsed in SLL mode and parsed again in LL mode.
+
+    Invalid filters are always parsed again in LL mode to report the error.
+    """
+    with _parse_counts_lock:
+        return ParseInfo(**_parse_counts)
+
+
+def parse_info_clear():
+    """Reset the parse statistics."""
+    with _parse_counts_lock:
+        _parse_counts.update(sll=0, ll=0)
+
+
+def warm_up(filters: Iterable[str]):
+    """Parse filters to build the DFAs of the ANTLR parser and lexer.
+
+    See `dump_dfa` to write them to a file.
+    """
+    for filter_ in filters:
+        with suppress(ValueError):
+            build_tree(filter_, lexer="antlr")
+
+
+def walk_tree(tree: ParserRuleContext, listener: OFLToSql) -> OFLToSql:
+    """Walk parse tree depth-first and notify listener like `ParseTreeWalker`.
+
+    Only the enter and exit methods the listener implements are called, looked up
+    in the dispatch table of `handlers`. Terminals, the every-rule methods and rules
+    without methods, like root, are skipped. Their children are still walked.
+
+    An explicit stack is used instead of recursion. Long chains of AND and OR build
+    parse trees which are deeper than the recursion limit.
+    """
+    table = handlers(type(listener))
+    stack: list[tuple[ParserRuleContext, Callable | None]] = [(tree, None)]
+    while stack:
+        node, exit_ = stack.pop()
+        if exit_ is not None:
+            exit_(listener, node)
+            continue
+        enter, exit_ = table.get(type(node), (None, None))
+        if enter is not None:
+            enter(listener, node)
+        if exit_ is not None:
+            stack.append((node, exit_))
+        if node.children:
+            stack.extend(
+                (child, None)
+                for child in reversed(node.children)
+                if isinstance(child, ParserRuleContext)
+            )
+    return listener
+
+
+@cache
+def handlers(
+    listener_type: type[OFLListener],
+) -> dict[type[ParserRuleContext], tuple[Callable | None, Callable | None]]:
+    """Dispatch table of `walk_tree` from context class to enter and exit method.
+
+    Methods which are not overridden are the no-ops of `OFLListener` and left out,
+    as are rules without any method.
+    """
+    table: dict[type[ParserRuleContext], tuple[Callable | None, Callable | None]] = {}
+    for name, context in vars(OFLParser).items():
+        if not name.endswith("Context") or not issubclass(context, ParserRuleContext):
+            continue
+        rule = name.removesuffix("Context")
+        enter, exit_ = (
+            method
+            if (method := getattr(listener_type, prefix + rule))
+            is not getattr(OFLListener, prefix + rule)
+            else None
+            for prefix in ("enter", "exit")
+        )
+        if (enter, exit_) != (None, None):
+            table[context] = (enter, exit_)
+    return table
+
+
+def descend(
+    filter_: str,
+    listener: OFLToSql,
+    builder: TreeBuilder | None = None,
+) -> OFLToSql:
+    """Translate filter with the recursive descent parser.
+
+    On any error the filter is translated again by the ANTLR parser. This way syntax
+    and translation errors are raised with exactly the same messages and in the
+    same order as by the ANTLR parser.
+    """
+    try:
+        types, texts = OFLScanner(filter_, OFLLexerErrorListener()).scan()
+        with recursion_limit(filter_):
+            return OFLDescentParser(types, texts, listener).parse()
+    except (DescentError, ValueError, IndexError):
+        listener.reset()
+        tree = (builder or TreeBuilder()).build_tree(filter_)
+        return walk_tree(tree, listener)
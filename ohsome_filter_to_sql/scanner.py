@@ -0,0 +1,167 @@
+"""Scanner for the ohsome filter language (OFL.g4).
+
+`OFLScanner` produces the same tokens as the lexer generated by ANTLR (`OFLLexer`).
+Instead of simulating the lexer ATN one character at a time it matches each token
+with one compiled regular expression. Keywords are matched as words and looked up in
+a table.
+"""
+
+import re
+from typing import cast
+
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.error.ErrorListener import ConsoleErrorListener, ErrorListener
+from antlr4.Token import CommonToken, Token
+
+from ohsome_filter_to_sql.descent import LITERALS
+from ohsome_filter_to_sql.OFLParser import OFLParser
+
+KEYWORDS: dict[str, int] = {
+    "and": OFLParser.AND,
+    "or": OFLParser.OR,
+    "not": OFLParser.NOT,
+    "in": OFLParser.IN,
+    "type": OFLParser.TYPE,
+    "id": OFLParser.ID,
+    "geometry": OFLParser.GEOMETRY,
+    "area": OFLParser.AREA,
+    "perimeter": OFLParser.PERIMETER,
+    "length": OFLParser.LENGTH,
+    "geometry.vertices": OFLParser.GEOMETRY_VERTICES,
+    "geometry.outers": OFLParser.GEOMETRY_OUTERS,
+    "geometry.inners": OFLParser.GEOMETRY_INNERS,
+    "changeset": OFLParser.CHANGESET,
+    "node": OFLParser.OSMTYPE,
+    "way": OFLParser.OSMTYPE,
+    "relation": OFLParser.OSMTYPE,
+    "point": OFLParser.GEOMETRY_TYPE,
+    "line": OFLParser.GEOMETRY_TYPE,
+    "polygon": OFLParser.GEOMETRY_TYPE,
+    "collection": OFLParser.GEOMETRY_TYPE,
+}
+
+# ANTLR picks the longest token and on a tie the rule defined first in OFL.g4. The
+# regular expression tries the alternatives in order instead. They are ordered and
+# guarded by lookaheads so that the first alternative which matches is the token
+# ANTLR picks. ERROR matches the text ANTLR reports if no token matches: the longest
+# prefix of a token and the character at which it fails.
+PATTERN = re.compile(
+    r"""
+    (?P<WS>[ \t\r\n]+)
+    |(?P<QUOTED>"(?:[^"\\\r\n]|\\["rn\\])+")
+    |(?P<OSMID>(?:node|way|relation)/[0-9]+)
+    |(?P<KEYWORD>geometry\.(?:vertices|outers|inners))
+    |(?P<DECIMAL>[0-9]+(?:\.[0-9]+(?:[Ee][0-9]+)?|[Ee][0-9]+(?![-_a-zA-Z0-9])))
+    |(?P<NUMBER>[0-9]+(?![-_a-zA-Z0-9]))
+    |(?P<WORD>[-_a-zA-Z0-9]+)
+    |(?P<LITERAL>!=|\.\.|[:=(),~*])
+    |(?P<ERROR>[!.].?|"(?:[^"\\\r\n]|\\["rn\\])*\\?.?|.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+TYPES: dict[str, int] = {
+    "WS": OFLParser.WS,
+    "QUOTED": OFLParser.QUOTED,
+    "OSMID": OFLParser.OSMID,
+    "DECIMAL": OFLParser.DECIMAL,
+    "NUMBER": OFLParser.NUMBER,
+}
+
+
+class OFLScanner:
+    """Token source for `OFLParser` which can be used in place of `OFLLexer`.
+
+    Errors are reported to the error listener with the same position and message as
+    by `OFLLexer`. If the listener does not raise, the characters of the reported
+    text are skipped.
+    """
+
+    def __init__(
+        self,
+        filter_: str,
+        error_listener: ErrorListener | None = None,
+    ):
+        if error_listener is None:
+            error_listener = cast(ErrorListener, ConsoleErrorListener.INSTANCE)
+        self.error_listener: ErrorListener = error_listener
+        self._source: tuple = (self, None)
+        self._factory = CommonTokenFactory.DEFAULT  # used by the error strategy
+        self.reset(filter_)
+
+    def reset(self, filter_: str):
+        """Start over with another filter."""
+        self.filter_: str = filter_
+        self.pos: int = 0
+        # line and column of the next token, read by CommonToken
+        self.line: int = 1
+        self.column: int = 0
+
+    def nextToken(self) -> Token:
+        while self.pos < len(self.filter_):
+            # ERROR matches any character which does not start another token
+            match = cast(re.Match[str], PATTERN.match(self.filter_, self.pos))
+            kind = cast(str, match.lastgroup)
+            text = match.group()
+            if kind == "ERROR":
+                self.error(text)
+                self.advance(text)
+                continue
+            if kind in ("WORD", "KEYWORD"):
+                type_ = KEYWORDS.get(text, OFLParser.WORD)
+            elif kind == "LITERAL":
+                type_ = LITERALS[text]
+            else:
+                type_ = TYPES[kind]
+            token = CommonToken(
+                self._source, type_, Token.DEFAULT_CHANNEL, self.pos, match.end() - 1
+            )
+            token.text = text
+            self.advance(text)
+            return token
+        token = CommonToken(
+            self._source, Token.EOF, Token.DEFAULT_CHANNEL, self.pos, self.pos - 1
+        )
+        token.text = "<EOF>"
+        return token
+
+    def scan(self) -> tuple[list[int], list[str]]:
+        """Types and texts of all remaining tokens, without creating token objects."""
+        types = []
+        texts = []
+        for match in PATTERN.finditer(self.filter_, self.pos):
+            kind = cast(str, match.lastgroup)
+            text = match.group()
+            if kind in ("WORD", "KEYWORD"):
+                types.append(KEYWORDS.get(text, OFLParser.WORD))
+            elif kind == "LITERAL":
+                types.append(LITERALS[text])
+            elif kind == "ERROR":
+                # line and column are only needed for the error message
+                self.locate(match.start())
+                self.error(text)
+                continue
+            else:
+                types.append(TYPES[kind])
+            texts.append(text)
+        self.locate(len(self.filter_))
+        return (types, texts)
+
+    def advance(self, text: str):
+        self.pos += len(text)
+        if "\n" in text:
+            self.line += text.count("\n")
+            self.column = len(text) - text.rfind("\n") - 1
+        else:
+            self.column += len(text)
+
+    def locate(self, pos: int):
+        self.pos = pos
+        self.line = self.filter_.count("\n", 0, pos) + 1
+        self.column = pos - self.filter_.rfind("\n", 0, pos) - 1
+
+    def error(self, text: str):
+        # message is based on antlr4 Lexer.notifyListeners
+        display = text.replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r")
+        msg = "token recognition error at: '" + display + "'"
+        self.error_listener.syntaxError(self, None, self.line, self.column, msg, None)
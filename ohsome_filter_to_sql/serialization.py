@@ -0,0 +1,219 @@
+"""Serialize compiled filters to a compact binary format.
+
+`dump_filter` writes the filter and the expressions of the intermediate
+representation (see `ir`). `load_filter` reads them back and translates the
+expressions to SQL without parsing the filter again, so that a filter is parsed
+once and its translation can be passed on to other processes and services.
+
+The data starts with a magic number and the version of the format. Values follow
+in postorder: each value is a tag byte and its payload, tuples and IR nodes are
+built from the values before them. Integers are variable-length. Unlike a pickle,
+loading the data does not run any code. No SQL is stored either: the SQL WHERE
+clause is generated from the IR, which passes all values as query arguments, so
+the data cannot inject SQL. Clauses kept as text (`ir.Verbatim`) are rejected.
+"""
+
+import struct
+from dataclasses import fields
+
+from ohsome_filter_to_sql import ir
+from ohsome_filter_to_sql.main import CompiledFilter
+
+MAGIC = b"OFL"
+VERSION = 3
+
+NONE = 0
+FALSE = 1
+TRUE = 2
+INT = 3
+FLOAT = 4
+STR = 5
+TUPLE = 6
+NODE = 16  # tag of the first node class, the others follow
+
+# The tag of a node class is its position here. New classes are appended, any
+# other change to the nodes requires a new version.
+NODES: tuple[type[ir.Node], ...] = (
+    ir.TagEq,
+    ir.TagNe,
+    ir.TagExists,
+    ir.TagNotExists,
+    ir.TagIn,
+    ir.TagLike,
+    ir.TypeEq,
+    ir.IdEq,
+    ir.TypeIdEq,
+    ir.IdIn,
+    ir.TypeIdIn,
+    ir.IdRange,
+    ir.GeomType,
+    ir.AreaRange,
+    ir.LengthRange,
+    ir.ChangesetEq,
+    ir.ChangesetIn,
+    ir.ChangesetRange,
+    ir.Verbatim,
+    ir.Unsupported,
+    ir.Group,
+    ir.Not,
+    ir.And,
+    ir.Or,
+)
+NODE_TAGS: dict[type, int] = {node: NODE + i for i, node in enumerate(NODES)}
+NODE_FIELDS: dict[type, tuple[str, ...]] = {
+    node: tuple(f.name for f in fields(node)) for node in NODES
+}
+
+DOUBLE = struct.Struct("<d")
+
+
+def dump_filter(compiled: CompiledFilter) -> bytes:
+    """Serialize a compiled filter, see `compile_filter`."""
+    buffer = bytearray(MAGIC)
+    buffer.append(VERSION)
+    encode((str(compiled), compiled.expressions), buffer)
+    return bytes(buffer)
+
+
+def load_filter(data: bytes) -> CompiledFilter:
+    """Deserialize a compiled filter written by `dump_filter`.
+
+    Raises:
+        ValueError: If the data is not a compiled filter of this version.
+    """
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Data is not a serialized compiled filter.")  # noqa: TRY003
+    version = data[len(MAGIC) : len(MAGIC) + 1]
+    if version != bytes((VERSION,)):
+        raise ValueError(
+            f"Unsupported version {int.from_bytes(version)} of a serialized "
+            + f"compiled filter. Expected version {VERSION}."
+        )
+    try:
+        value = decode(memoryview(data)[len(MAGIC) + 1 :])
+    except (IndexError, TypeError, struct.error) as error:
+        raise ValueError("Serialized compiled filter is corrupt.") from error  # noqa: TRY003
+    match value:
+        case (str(filter_), tuple(expressions)) if all(
+            isinstance(expression, ir.Node) for expression in expressions
+        ):
+            pass
+        case _:
+            raise ValueError("Serialized compiled filter is corrupt.")  # noqa: TRY003
+    try:
+        return CompiledFilter.from_expressions(filter_, expressions)
+    except (AttributeError, IndexError, KeyError, TypeError) as error:
+        # values of the wrong type in the expressions
+        raise ValueError("Serialized compiled filter is corrupt.") from error  # noqa: TRY003
+
+
+def encode_varint(n: int, buffer: bytearray):
+    while n > 0x7F:
+        buffer.append(n & 0x7F | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+
+def decode_varint(data: memoryview, position: int) -> tuple[int, int]:
+    n = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (n, position)
+        shift += 7
+
+
+def encode(value: object, buffer: bytearray):
+    # items are written before their tuple or node, in postorder
+    todo: list[tuple[object, bool]] = [(value, False)]
+    while todo:
+        value, visited = todo.pop()
+        if visited and isinstance(value, tuple):
+            buffer.append(TUPLE)
+            encode_varint(len(value), buffer)
+        elif visited:
+            buffer.append(NODE_TAGS[type(value)])
+        elif isinstance(value, tuple):
+            todo.append((value, True))
+            todo.extend((item, False) for item in reversed(value))
+        elif type(value) in NODE_TAGS:
+            todo.append((value, True))
+            names = NODE_FIELDS[type(value)]
+            todo.extend((getattr(value, name), False) for name in reversed(names))
+        else:
+            encode_scalar(value, buffer)
+
+
+def encode_scalar(value: object, buffer: bytearray):
+    match value:
+        case None:
+            buffer.append(NONE)
+        case bool():
+            buffer.append(TRUE if value else FALSE)
+        case int():
+            # zigzag encoding of negative numbers
+            buffer.append(INT)
+            encode_varint(value * 2 if value >= 0 else -value * 2 - 1, buffer)
+        case float():
+            buffer.append(FLOAT)
+            buffer += DOUBLE.pack(value)
+        case str():
+            data = value.encode()
+            buffer.append(STR)
+            encode_varint(len(data), buffer)
+            buffer += data
+        case _:
+            raise TypeError(f"Cannot serialize {type(value).__name__}.")  # noqa: TRY003
+
+
+def decode(data: memoryview) -> object:  # noqa: C901
+    stack: list = []
+    position = 0
+    while position < len(data):
+        tag = data[position]
+        position += 1
+        match tag:
+            case 0:  # NONE
+                stack.append(None)
+            case 1:  # FALSE
+                stack.append(False)
+            case 2:  # TRUE
+                stack.append(True)
+            case 3:  # INT
+                n, position = decode_varint(data, position)
+                stack.append(n >> 1 if n & 1 == 0 else -(n >> 1) - 1)
+            case 4:  # FLOAT
+                stack.append(DOUBLE.unpack_from(data, position)[0])
+                position += DOUBLE.size
+            case 5:  # STR
+                n, position = decode_varint(data, position)
+                if position + n > len(data):
+                    raise IndexError(position + n)
+                stack.append(str(data[position : position + n], "utf-8"))
+                position += n
+            case 6:  # TUPLE
+                n, position = decode_varint(data, position)
+                stack.append(tuple(pop(stack, n)))
+            case _ if tag >= NODE:
+                node = NODES[tag - NODE]
+                if node is ir.Verbatim:
+                    # its text is emitted as SQL and must not come from the data
+                    raise TypeError(node)
+                stack.append(ir.intern(node(*pop(stack, len(NODE_FIELDS[node])))))
+            case _:
+                raise IndexError(tag)
+    if len(stack) != 1:
+        raise IndexError(len(stack))
+    return stack[0]
+
+
+def pop(stack: list, n: int) -> list:
+    """Pop the last n values off the stack."""
+    if n > len(stack):
+        raise IndexError(n)
+    values = stack[len(stack) - n :]
+    del stack[len(stack) - n :]
+    return values
@@ -0,0 +1,317 @@
+"""Emit the SQL WHERE clause for ohsome DB from the intermediate representation."""
+
+import json
+from collections import deque
+from collections.abc import Iterable
+
+from ohsome_filter_to_sql.cache import LRUCache
+from ohsome_filter_to_sql.errors import InvalidRangeError, UnsupportedClauseError
+from ohsome_filter_to_sql.ir import (
+    And,
+    AreaRange,
+    ChangesetEq,
+    ChangesetIn,
+    ChangesetRange,
+    Expression,
+    GeomType,
+    Group,
+    IdEq,
+    IdIn,
+    IdRange,
+    LengthRange,
+    Not,
+    Or,
+    TagEq,
+    TagExists,
+    TagIn,
+    TagLike,
+    TagNe,
+    TagNotExists,
+    TypeEq,
+    TypeIdEq,
+    TypeIdIn,
+    Unsupported,
+    Verbatim,
+)
+
+# JSON of tag matches shared by all translations
+_literals = LRUCache(maxsize=65_536)
+
+
+def containment(key: str, value: str) -> str:
+    """JSON object of a tag for the containment operator @>."""
+    literal = _literals.get((key, value))
+    if literal is None:
+        literal = json.dumps({key: value})
+        _literals.put((key, value), literal)
+    return literal
+
+
+def to_sql(
+    expressions: Iterable[Expression], args_shift: int = 0
+) -> tuple[str, tuple[str | int | float | tuple, ...]]:
+    """SQL WHERE clause and query arguments of expressions built by `OFLToSql`."""
+    emitter = SqlEmitter(args_shift)
+    for expression in expressions:
+        emitter.emit(expression)
+    return (emitter.query(), tuple(emitter.args))
+
+
+class SqlEmitter:
+    """Emit SQL in a depth-first pass over the IR.
+
+    Clauses are emitted in the order of the filter and push their SQL on a stack,
+    from which the operators take their operands. Composed expressions are kept as
+    a deque of SQL fragments, which are joined once by `query`. Building a new
+    string at every operator would copy the SQL of long AND and OR chains over and
+    over again.
+    """
+
+    def __init__(self, args_shift: int = 0):
+        self.stack: deque[str | deque[str]] = deque()
+        self.args: deque[str | int | float | tuple] = deque()
+        self.args_shift: int = args_shift
+
+    @property
+    def args_len(self) -> int:
+        return len(self.args) + self.args_shift
+
+    def query(self) -> str:
+        return " ".join(
+            item if isinstance(item, str) else "".join(item) for item in self.stack
+        )
+
+    def emit(self, expression: Expression):
+        """Push the SQL of an expression, walking the IR without recursion."""
+        todo: list[tuple[Expression, bool]] = [(expression, False)]
+        while todo:
+            node, visited = todo.pop()
+            match node:
+                case Group() | Not() if not visited:
+                    todo.append((node, True))
+                    todo.append((node.expression, False))
+                case And() | Or() if not visited:
+                    todo.append((node, True))
+                    todo.extend((operand, False) for operand in reversed(node.operands))
+                case Group():
+                    self.parentheses()
+                case Not():
+                    self.negation()
+                case And():
+                    self.chain("AND", len(node.operands))
+                case Or():
+                    self.chain("OR", len(node.operands))
+                case _:
+                    self.clause(node)
+
+    def clause(self, node: Expression):  # noqa: C901
+        match node:
+            case TagEq(key, value):
+                self.tag_match(key, value)
+            case TagNe(key, value):
+                self.tag_not_match(key, value)
+            case TagExists(key):
+                self.tag_wildcard_match(key)
+            case TagNotExists(key):
+                self.tag_not_wildcard_match(key)
+            case TagIn(key, values):
+                self.tag_list_match(key, values)
+            case TagLike(key, value, prefix, suffix):
+                self.tag_value_pattern_match(key, value, prefix, suffix)
+            case TypeEq(type_):
+                self.type_match(type_)
+            case IdEq(id_):
+                self.id_match(id_)
+            case TypeIdEq(type_, id_):
+                self.type_id_match(type_, id_)
+            case IdIn(ids):
+                self.id_list_match(ids)
+            case TypeIdIn(type_ids):
+                self.type_id_list_match(type_ids)
+            case IdRange(lower, upper):
+                self.range_match("osm_id", lower, upper)
+            case GeomType(geom_type):
+                self.geometry_match(geom_type)
+            case AreaRange(lower, upper):
+                self.range_match("area", lower, upper)
+            case LengthRange(lower, upper):
+                self.range_match("length", lower, upper)
+            case ChangesetEq(id_):
+                self.changeset_match(id_)
+            case ChangesetIn(ids):
+                self.changeset_list_match(ids)
+            case ChangesetRange(lower, upper):
+                self.changeset_range_match(lower, upper)
+            case Verbatim(text):
+                self.stack.append(text)
+            case Unsupported(text):
+                raise UnsupportedClauseError(text)
+
+    def fragments(self) -> deque[str]:
+        expression = self.stack.pop()
+        if isinstance(expression, str):
+            return deque((expression,))
+        return expression
+
+    def parentheses(self):
+        fragments = self.fragments()
+        fragments.appendleft("(")
+        fragments.append(")")
+        self.stack.append(fragments)
+
+    def negation(self):
+        fragments = self.fragments()
+        fragments.appendleft("NOT ")
+        self.stack.append(fragments)
+
+    def chain(self, operator: str, n: int):
+        operands = [self.fragments() for _ in range(n)]
+        operands.reverse()
+        # the fragments of the other operands are moved to the longest one
+        longest = max(range(n), key=lambda i: len(operands[i]))
+        fragments = operands[longest]
+        separator = f" {operator} "
+        for operand in reversed(operands[:longest]):
+            fragments.appendleft(separator)
+            fragments.extendleft(reversed(operand))
+        for operand in operands[longest + 1 :]:
+            fragments.append(separator)
+            fragments.extend(operand)
+        self.stack.append(fragments)
+
+    # ---
+    #
+    def tag_match(self, key: str, value: str):
+        # @> Does the first JSON value contain the second?
+        self.args.append(containment(key, value))
+        self.stack.append(f"tags @> ${self.args_len}")
+
+    def tag_value_pattern_match(self, key: str, value: str, prefix: bool, suffix: bool):
+        value = value.replace("%", "\\%").replace("_", "\\_").replace("'", "''")
+        key = key.replace("'", "''")
+        if prefix:
+            value = "%" + value
+        if suffix:
+            value = value + "%"
+
+        self.args.append(key)
+        self.args.append(value)
+        self.stack.append(
+            f"((tags->>${self.args_len - 1}) IS NOT NULL "
+            f"AND (tags->>${self.args_len - 1}) LIKE ${self.args_len})"
+        )
+
+    def tag_wildcard_match(self, key: str):
+        self.args.append(key)
+        self.stack.append(f"tags ? ${self.args_len}")
+
+    def tag_not_match(self, key: str, value: str):
+        self.args.append(containment(key, value))
+        self.stack.append(f"NOT tags @> ${self.args_len}")
+
+    def tag_not_wildcard_match(self, key: str):
+        self.args.append(key)
+        self.stack.append(f"NOT tags ? ${self.args_len}")
+
+    def tag_list_match(self, key: str, values: tuple[str, ...]):
+        self.args.append(key)
+        self.args.append(tuple('"' + value + '"' for value in values))
+        self.stack.append(
+            f"((tags->${self.args_len - 1}) IS NOT NULL "
+            f"AND (tags->${self.args_len - 1}) = ANY(${self.args_len}))"
+        )
+
+    # ---
+    #
+    def type_match(self, type_: str):
+        self.args.append(type_)
+        self.stack.append(f"osm_type = ${self.args_len}")
+
+    def id_match(self, id_: int):
+        self.args.append(id_)
+        self.stack.append(f"osm_id = ${self.args_len}")
+
+    def type_id_match(self, type_: str, id_: int):
+        self.args.append(type_)
+        self.args.append(id_)
+        self.stack.append(
+            f"(osm_type = ${self.args_len - 1} AND osm_id = ${self.args_len})"
+        )
+
+    def range_match(
+        self, column: str, lower_bound: float | None, upper_bound: float | None
+    ):
+        """Range of OSM IDs, area or length. Bounds of 0 are treated as no bound."""
+        if lower_bound and upper_bound:
+            if lower_bound > upper_bound:
+                raise InvalidRangeError(upper_bound, lower_bound)
+            self.args.append(lower_bound)
+            self.args.append(upper_bound)
+            self.stack.append(
+                f"({column} >= ${self.args_len - 1} AND {column} <= ${self.args_len})"
+            )
+        elif lower_bound:
+            self.args.append(lower_bound)
+            self.stack.append(f"{column} >= ${self.args_len}")
+        elif upper_bound:
+            self.args.append(upper_bound)
+            self.stack.append(f"{column} <= ${self.args_len}")
+
+    def id_list_match(self, ids: tuple[int, ...]):
+        self.args.append(ids)
+        self.stack.append(f"osm_id = ANY(${self.args_len})")
+
+    def type_id_list_match(self, type_ids: tuple[tuple[str, int], ...]):
+        values = []
+        for type_, id_ in type_ids:
+            self.args.append(id_)
+            self.args.append(type_)
+            values.append(
+                f"(osm_id = ${self.args_len - 1} AND osm_type = ${self.args_len})"
+            )
+        if len(values) > 1:
+            self.stack.append("(" + " OR ".join(values) + ")")
+        else:
+            self.stack.append(" OR ".join(values))
+
+    # ---
+    #
+    def geometry_match(self, geom_type: str):
+        match geom_type:
+            case "point":
+                self.stack.append("(status_geom_type).geom_type = 'Point'")
+            case "line":
+                self.stack.append("(status_geom_type).geom_type = 'LineString'")
+            case "polygon":
+                self.stack.append(
+                    "((status_geom_type).geom_type = 'Polygon' "
+                    + "OR (status_geom_type).geom_type = 'MultiPolygon')"
+                )
+            case "collection":
+                self.stack.append("(status_geom_type).geom_type = 'GeometryCollection'")
+
+    # ---
+    #
+    def changeset_match(self, id_: int):
+        self.args.append(id_)
+        self.stack.append(f"changeset_id = ${self.args_len}")
+
+    def changeset_list_match(self, ids: tuple[int, ...]):
+        self.args.append(ids)
+        self.stack.append(f"changeset_id = ANY(${self.args_len})")
+
+    def changeset_range_match(self, lower_bound: int | None, upper_bound: int | None):
+        # unlike other ranges, bounds of changeset ranges are not checked
+        if lower_bound and upper_bound:
+            self.args.append(lower_bound)
+            self.args.append(upper_bound)
+            self.stack.append(
+                f"(changeset_id >= ${self.args_len - 1} "
+                f"AND changeset_id <= ${self.args_len})"
+            )
+        elif lower_bound:
+            self.args.append(lower_bound)
+            self.stack.append(f"changeset_id >= ${self.args_len}")
+        elif upper_bound:
+            self.args.append(upper_bound)
+            self.stack.append(f"changeset_id <= ${self.args_len}")
@@ -0,0 +1,66 @@
+"""Translate trivial filters without parsing them.
+
+Most filters are a tag match like natural=tree or key=*, a type or a geometry
+type, or a few of them joined by and. Such filters are recognized by regular
+expressions and translated by the methods of `OFLToSql`, which build the same IR
+as the parsers. No lexer and parser are needed. Any other filter is left to the
+parsers.
+"""
+
+import re
+
+from ohsome_filter_to_sql.descent import Emitter
+
+WS = r"[ \t\r\n]*"
+# An unquoted string (see rule string in OFL.g4): words joined by ':' or a number.
+# Words starting with a numeral are left to the parsers, they may be a DECIMAL.
+STRING = r"[-_a-zA-Z][-_a-zA-Z0-9]*(?::[-_a-zA-Z][-_a-zA-Z0-9]*)*|[0-9]+"
+TERM = re.compile(
+    rf"type{WS}:{WS}(?P<type>node|way|relation)"
+    rf"|geometry{WS}:{WS}(?P<geometry>point|line|polygon|collection)"
+    rf"|(?P<key>{STRING}){WS}={WS}(?:(?P<wildcard>\*)|(?P<value>{STRING}))"
+)
+AND = re.compile(r"[ \t\r\n]+and[ \t\r\n]+")
+# Strings with keywords are left to the parsers, which tell them from clauses.
+KEYWORDS = frozenset(
+    (
+        "and",
+        "or",
+        "not",
+        "in",
+        "type",
+        "id",
+        "geometry",
+        "area",
+        "perimeter",
+        "length",
+        "changeset",
+    )
+)
+
+
+def translate_trivial(filter_: str, emitter: Emitter) -> bool:
+    """Translate a trivial filter. Whether the filter was trivial and translated."""
+    terms = []
+    for text in AND.split(filter_):
+        term = TERM.fullmatch(text)
+        if term is None or has_keyword(term["key"]) or has_keyword(term["value"]):
+            return False
+        terms.append(term)
+    for i, term in enumerate(terms):
+        if term["type"] is not None:
+            emitter.type_match(term["type"])
+        elif term["geometry"] is not None:
+            emitter.geometry_match(term["geometry"])
+        elif term["wildcard"] is not None:
+            emitter.tag_wildcard_match(emitter.string([term["key"]]))
+        else:
+            key = emitter.string([term["key"]])
+            emitter.tag_match(key, emitter.string([term["value"]]))
+        if i > 0:
+            emitter.binary("AND")
+    return True
+
+
+def has_keyword(string: str | None) -> bool:
+    return string is not None and not KEYWORDS.isdisjoint(string.split(":"))
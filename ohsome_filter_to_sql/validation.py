@@ -0,0 +1,87 @@
+"""Validation of arguments with pydantic.
+
+Arguments of the expected types are checked in `ohsome_filter_to_sql.main` without
+pydantic. This module, and with it pydantic, is imported only for arguments which
+have to be converted or are invalid, and for the `OhsomeFilter` type.
+"""
+
+from pathlib import Path
+from typing import Annotated, Literal
+
+from pydantic import (
+    AfterValidator,
+    Field,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
+    validate_call,
+)
+from typing_extensions import TypeAliasType
+
+from ohsome_filter_to_sql.main import CompiledFilter, Engine, validate_filter
+
+
+def keep_compiled_filter(filter_: object, handler: ValidatorFunctionWrapHandler):
+    """Pass a compiled filter on as it is instead of validating it as str."""
+    if isinstance(filter_, CompiledFilter):
+        return filter_
+    return handler(filter_)
+
+
+@validate_call
+def ohsome_filter_to_sql(
+    filter_: Annotated[str, Field(min_length=1), WrapValidator(keep_compiled_filter)],
+    args_shift: Annotated[int, Field(ge=0, default=0)] = 0,
+    engine: Engine = "antlr",
+) -> tuple[str, int, Engine]:
+    """Validated arguments of `ohsome_filter_to_sql`."""
+    return (filter_, args_shift, engine)
+
+
+@validate_call
+def compile_filter(
+    filter_: Annotated[str, Field(min_length=1)],
+    engine: Engine = "antlr",
+) -> tuple[str, Engine]:
+    """Validated arguments of `compile_filter`."""
+    return (filter_, engine)
+
+
+@validate_call
+def ohsome_filter_to_sql_many(
+    args_shift: Annotated[int, Field(ge=0, default=0)] = 0,
+    engine: Engine = "antlr",
+) -> tuple[int, Engine]:
+    """Validated arguments of `ohsome_filter_to_sql_many`, except the filters."""
+    return (args_shift, engine)
+
+
+@validate_call
+def ohsome_filter_to_sql_parallel(
+    args_shift: Annotated[int, Field(ge=0, default=0)] = 0,
+    engine: Engine = "antlr",
+    pool: Literal["process", "interpreter"] = "process",
+    max_workers: Annotated[int, Field(ge=1)] | None = None,
+    chunksize: Annotated[int, Field(ge=1)] = 256,
+    dfa_cache: str | Path | None = None,
+) -> tuple[
+    int,
+    Engine,
+    Literal["process", "interpreter"],
+    int | None,
+    int,
+    str | Path | None,
+]:
+    """Validated arguments of `ohsome_filter_to_sql_parallel`, except the filters."""
+    return (args_shift, engine, pool, max_workers, chunksize, dfa_cache)
+
+
+@validate_call
+def set_cache_size(maxsize: Annotated[int, Field(ge=0)]) -> int:
+    """Validated argument of `set_cache_size`."""
+    return maxsize
+
+
+OhsomeFilter = TypeAliasType(
+    "OhsomeFilter",
+    Annotated[str, AfterValidator(validate_filter)],
+)
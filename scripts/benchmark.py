@@ -0,0 +1,78 @@
+"""Microbenchmarks of ohsome_filter_to_sql.
+
+call overhead: Translations are served from the cache, so that the time is spent
+    on argument validation and the cache lookup only.
+filter length: Time per term of OR chains of growing length, which stays about
+    the same if translation time grows linearly with the length of a filter.
+import time: Cumulative time of importing the package and its main module in a
+    new interpreter (python -X importtime).
+
+USAGE:
+    uv run python scripts/benchmark.py
+"""
+
+import subprocess
+import sys
+import timeit
+
+from ohsome_filter_to_sql.main import (
+    ENGINES,
+    compile_filter,
+    ohsome_filter_to_sql,
+)
+from ohsome_filter_to_sql.validation import ohsome_filter_to_sql as validate_args
+
+FILTER = "(landuse=forest or natural=wood) and geometry:polygon"
+NUMBER = 100_000
+
+
+def call_overhead():
+    ohsome_filter_to_sql(FILTER, args_shift=1)  # fill cache
+    cases = {
+        "pydantic validate_call": lambda: ohsome_filter_to_sql(
+            *validate_args(FILTER, 1)
+        ),
+        "fast path": lambda: ohsome_filter_to_sql(FILTER, 1),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=NUMBER, repeat=5))
+        print(f"{name:<24} {seconds / NUMBER * 1e6:6.2f} µs per call")
+
+
+def filter_length():
+    for engine in ENGINES:
+        for terms in (1_000, 4_000, 16_000):
+            filter_ = " or ".join(f"key{i}=value" for i in range(terms))
+            seconds = min(
+                timeit.repeat(lambda: compile_filter(filter_, engine), number=1)  # noqa: B023
+            )
+            print(
+                f"{engine:<7} {terms:>6} terms {seconds / terms * 1e6:6.2f} µs per term"
+            )
+
+
+def import_time():
+    for module in ("ohsome_filter_to_sql", "ohsome_filter_to_sql.main"):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        for line in result.stderr.splitlines():
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            if name.strip() == module:
+                print(f"{module:<26} {int(cumulative) / 1000:6.1f} ms")
+
+
+def main():
+    print("call overhead")
+    call_overhead()
+    print("filter length")
+    filter_length()
+    print("import time")
+    import_time()
+
+
+if __name__ == "__main__":
+    main()
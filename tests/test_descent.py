@@ -0,0 +1,178 @@
+from pathlib import Path
+from typing import Literal
+
+import pytest
+from antlr4 import InputStream
+from pydantic import ValidationError
+
+from ohsome_filter_to_sql.descent import LITERALS, DescentError, OFLDescentParser
+from ohsome_filter_to_sql.main import (
+    OFLLexerErrorListener,
+    OFLToSql,
+    TreeBuilder,
+    build_tree,
+    compile_filter,
+    descend,
+    ohsome_filter_to_sql,
+    ohsome_filter_to_sql_many,
+    walk_tree,
+)
+from ohsome_filter_to_sql.OFLLexer import OFLLexer
+from ohsome_filter_to_sql.scanner import OFLScanner
+from ohsome_filter_to_sql.sql import to_sql
+
+APPROVALS = Path(__file__).parent / "approvals"
+
+
+def approved_filters() -> list[str]:
+    """Filters of the approval tests (first paragraph of each approved file)."""
+    filters = {
+        path.read_text().split("\n\n")[0] for path in APPROVALS.glob("*.approved.txt")
+    }
+    return sorted(filters)
+
+
+def translate(filter_: str, engine: Literal["antlr", "stream", "descent"]) -> tuple:
+    listener = OFLToSql()
+    try:
+        if engine == "antlr":
+            walk_tree(build_tree(filter_), listener)
+        elif engine == "stream":
+            listener = TreeBuilder().translate(filter_, listener)
+        else:
+            listener = descend(filter_, listener)
+        expressions = listener.expressions()
+        return (expressions, to_sql(expressions))
+    except Exception as error:
+        return (type(error), str(error))
+
+
+def translate_without_fallback(filter_: str) -> tuple:
+    types, texts = OFLScanner(filter_, OFLLexerErrorListener()).scan()
+    expressions = OFLDescentParser(types, texts, OFLToSql()).parse().expressions()
+    return (expressions, to_sql(expressions))
+
+
+EDGE_CASES = (
+    "not=yes",
+    "not not=yes",
+    "not:foo=bar",
+    "not in (yes, no)",
+    "not in in (yes, no)",
+    "not in=yes",
+    "and=yes or or=no",
+    "type:node=yes",
+    "type:node:foo=yes",
+    "type:node in (a, b)",
+    "type:foo=bar",
+    "type : node and natural=tree",
+    "geometry:point=yes",
+    "geometry:point and geometry:line",
+    "id:foo=bar",
+    "area:=yes",
+    "addr:in (1, 2)",
+    "a:in in (1, 2)",
+    "x=a:and y=b",
+    "x=a: and y=b",
+    "not a=b and c=d or e=f",
+    "a=b or c=d and not e=f",
+    "not (a=b or c=d)",
+    " (a=b)",
+    " a=b",
+    "a=b ",
+    "(a=b) ",
+    " not a=b",
+    "a=b and(c=d)",
+    "a=band c=d",
+    "key ~ *foo",
+    "key ~ foo*",
+    "key ~ * foo",
+    "id:(0..5)",
+    "id:(0..)",
+    "id:(0..0) and a=b",
+    "id:(5..1) and (",
+    "area:(1..2) and length:(..3.5)",
+    "area:5",
+    "id:(1.5..2)",
+    "changeset:(3..1)",
+    "perimeter:(1..2)",
+    "geometry.vertices:(1..2)",
+    "geometry.outers:1",
+    "geometry.vertices=3",
+    "*",
+    "* ",
+    "(*)",
+    "natural=tree)",
+    "((natural=tree)",
+)
+
+
+@pytest.mark.parametrize("filter_", approved_filters() + list(EDGE_CASES))
+def test_descent_parser_parity(filter_):
+    assert translate(filter_, "descent") == translate(filter_, "antlr")
+
+
+@pytest.mark.parametrize("filter_", approved_filters() + list(EDGE_CASES))
+def test_streaming_parity(filter_):
+    """Translating while parsing equals walking the parse tree."""
+    assert translate(filter_, "stream") == translate(filter_, "antlr")
+
+
+@pytest.mark.parametrize("filter_", approved_filters())
+def test_descent_parser_accepts_valid_filters(filter_):
+    """The recursive descent parser does not fall back to ANTLR for valid filters."""
+    expected = translate(filter_, "antlr")
+    if isinstance(expected[0], type):
+        with pytest.raises((DescentError, ValueError, IndexError)):
+            translate_without_fallback(filter_)
+    else:
+        assert translate_without_fallback(filter_) == expected
+
+
+@pytest.mark.parametrize("text", ("(", ")", ":", "=", ",", "!=", "~", "..", "and"))
+def test_literals(text):
+    """Literals are looked up by text like the lexer generated from OFL.g4 does."""
+    lexer = OFLLexer(InputStream(text))
+    assert LITERALS[text] == lexer.nextToken().type
+
+
+def test_ohsome_filter_to_sql_engine():
+    filter_ = "(landuse=forest or natural=wood) and geometry:polygon"
+    assert ohsome_filter_to_sql(filter_, engine="descent") == ohsome_filter_to_sql(
+        filter_, engine="antlr"
+    )
+
+
+def test_ohsome_filter_to_sql_engine_invalid():
+    with pytest.raises(ValidationError):
+        ohsome_filter_to_sql("natural=tree", engine="foo")  # ty: ignore[invalid-argument-type]
+
+
+@pytest.mark.parametrize("args_shift", (0, 1, 12))
+@pytest.mark.parametrize("filter_", approved_filters())
+def test_compiled_filter_args_shift(filter_, args_shift):
+    """Shifted query arguments of a compiled filter equal a direct translation."""
+    try:
+        expected = ohsome_filter_to_sql(filter_, args_shift=args_shift)
+    except Exception as error:
+        with pytest.raises(type(error)):
+            compile_filter(filter_)
+    else:
+        assert compile_filter(filter_).to_sql(args_shift) == expected
+
+
+@pytest.mark.parametrize("engine", ("antlr", "descent"))
+def test_ohsome_filter_to_sql_many_parity(engine):
+    """A batch with reused lexer and parser equals translating each filter."""
+    filters = approved_filters() + list(EDGE_CASES)
+    expected = []
+    for filter_ in filters:
+        try:
+            expected.append(ohsome_filter_to_sql(filter_, args_shift=2, engine=engine))
+        except Exception as error:
+            expected.append((type(error), str(error)))
+    results = ohsome_filter_to_sql_many(filters, args_shift=2, engine=engine)
+    assert [
+        result if isinstance(result, tuple) else (type(result), str(result))
+        for result in results
+    ] == expected
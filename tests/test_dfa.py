@@ -0,0 +1,98 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+from antlr4.dfa.DFA import DFA
+
+from ohsome_filter_to_sql.dfa import dump_dfa, load_dfa
+from ohsome_filter_to_sql.main import build_tree, warm_up
+from ohsome_filter_to_sql.OFLLexer import OFLLexer
+from ohsome_filter_to_sql.OFLParser import OFLParser
+from tests.test_descent import approved_filters
+
+FILTER = "(landuse=forest or natural=wood) and geometry:polygon and id:(1, 2)"
+
+
+def reset_dfa():
+    for recognizer in (OFLLexer, OFLParser):
+        recognizer.decisionsToDFA[:] = [
+            DFA(state, i) for i, state in enumerate(recognizer.atn.decisionToState)
+        ]
+    OFLParser.sharedContextCache.cache = {}
+
+
+def dfa_size() -> int:
+    dfas = OFLLexer.decisionsToDFA + OFLParser.decisionsToDFA
+    return sum(len(dfa.states) for dfa in dfas)
+
+
+@pytest.fixture
+def dfa_file(tmp_path):
+    warm_up(approved_filters())
+    path = tmp_path / "dfa.pickle"
+    dump_dfa(path)
+    return path
+
+
+def test_load_dfa(dfa_file):
+    size = dfa_size()
+    names = OFLParser.ruleNames
+    tree = build_tree(FILTER, lexer="antlr").toStringTree(ruleNames=names)
+    reset_dfa()
+    assert dfa_size() == 0
+    assert load_dfa(dfa_file)
+    assert dfa_size() == size
+    assert build_tree(FILTER, lexer="antlr").toStringTree(ruleNames=names) == tree
+    warm_up(approved_filters())
+    assert dfa_size() == size
+
+
+def test_load_dfa_at_import(dfa_file):
+    """A new process does not add any DFA states while parsing the same filters."""
+    size = dfa_size()
+    code = (
+        "from ohsome_filter_to_sql.main import warm_up;"
+        "from tests.test_descent import approved_filters;"
+        "from tests.test_dfa import dfa_size;"
+        "print(dfa_size());"
+        "warm_up(approved_filters());"
+        "print(dfa_size())"
+    )
+    env = os.environ | {"OHSOME_FILTER_TO_SQL_DFA_CACHE": str(dfa_file)}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], env=env, capture_output=True, check=True
+    )
+    assert result.stdout.split() == [str(size).encode(), str(size).encode()]
+
+
+def test_load_dfa_version_mismatch(tmp_path):
+    path = tmp_path / "dfa.pickle"
+    with open(path, "wb") as file:
+        pickle.dump("0000", file)
+    decisions = list(OFLParser.decisionsToDFA)
+    assert not load_dfa(path)
+    assert OFLParser.decisionsToDFA == decisions
+
+
+@pytest.mark.parametrize("corruption", ("missing", "truncated", "garbage"))
+def test_load_dfa_at_import_invalid(dfa_file, corruption):
+    """A missing or corrupt DFA cache is not loaded, with a warning."""
+    match corruption:
+        case "missing":
+            dfa_file.unlink()
+        case "truncated":
+            dfa_file.write_bytes(dfa_file.read_bytes()[:1000])
+        case "garbage":
+            dfa_file.write_bytes(b"garbage\n")
+    code = (
+        "from ohsome_filter_to_sql import ohsome_filter_to_sql;"
+        "print(ohsome_filter_to_sql('natural=tree or type:way')[0])"
+    )
+    env = os.environ | {"OHSOME_FILTER_TO_SQL_DFA_CACHE": str(dfa_file)}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], env=env, capture_output=True, check=True
+    )
+    assert result.stdout.strip() == b"tags @> $1 OR osm_type = $2"
+    assert b"UserWarning: DFA cache" in result.stderr
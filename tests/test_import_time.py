@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+
+def imported_modules(module: str) -> set[str]:
+    """Names of all modules loaded by importing a module in a new interpreter."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", f"import sys, {module}; print(*sys.modules)"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+def import_time(module: str) -> float:
+    """Cumulative import time of a module in seconds, as reported by -X importtime."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1e6
+    raise LookupError(module)
+
+
+def test_import_package():
+    """The package imports its modules on first access of one of their names."""
+    modules = imported_modules("ohsome_filter_to_sql")
+    assert "antlr4" not in modules
+    assert "pydantic" not in modules
+    assert "ohsome_filter_to_sql.main" not in modules
+
+
+def test_import_cli():
+    """The command line interface does not import pydantic for valid arguments."""
+    modules = imported_modules("ohsome_filter_to_sql.main")
+    assert "pydantic" not in modules
+    assert "typing_extensions" not in modules
+    # the ANTLR runtime and the generated parser are imported on first translation
+    assert "antlr4" not in modules
+    assert "ohsome_filter_to_sql.OFLParser" not in modules
+    assert "ohsome_filter_to_sql.OFLLexer" not in modules
+
+
+def test_import_cli_time():
+    # a loose bound, which is exceeded if main imports pydantic and the parser again
+    assert import_time("ohsome_filter_to_sql.main") < 0.1
+
+
+def test_reexports():
+    """Names of other modules are still imported from main on first access."""
+    modules = imported_modules(
+        "ohsome_filter_to_sql.main;"
+        + "from ohsome_filter_to_sql.main import OhsomeFilter, OFLToSql, build_tree"
+    )
+    assert "ohsome_filter_to_sql.parsing" in modules
+    assert "ohsome_filter_to_sql.validation" in modules
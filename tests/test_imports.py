@@ -2,3 +2,18 @@ def test_imports():
     from ohsome_filter_to_sql import ohsome_filter_to_sql  # noqa
     from ohsome_filter_to_sql import validate_filter  # noqa
     from ohsome_filter_to_sql import OhsomeFilter  # noqa
+    from ohsome_filter_to_sql import cache_clear  # noqa
+    from ohsome_filter_to_sql import cache_info  # noqa
+    from ohsome_filter_to_sql import set_cache_size  # noqa
+    from ohsome_filter_to_sql import parse_info  # noqa
+    from ohsome_filter_to_sql import parse_info_clear  # noqa
+    from ohsome_filter_to_sql import dump_dfa  # noqa
+    from ohsome_filter_to_sql import load_dfa  # noqa
+    from ohsome_filter_to_sql import warm_up  # noqa
+    from ohsome_filter_to_sql import CompiledFilter  # noqa
+    from ohsome_filter_to_sql import compile_filter  # noqa
+    from ohsome_filter_to_sql import ohsome_filter_to_sql_many  # noqa
+    from ohsome_filter_to_sql import Translator  # noqa
+    from ohsome_filter_to_sql import ohsome_filter_to_sql_parallel  # noqa
+    from ohsome_filter_to_sql import dump_filter  # noqa
+    from ohsome_filter_to_sql import load_filter  # noqa
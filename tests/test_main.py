@@ -3,22 +3,42 @@
 # - https://docs.ohsome.org/ohsome-api/v1/filter.html
 # - https://github.com/GIScience/ohsome-dashboard/blob/main/src/prism-language-ohsome-filter.ts
 import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 
 import asyncpg
 import asyncpg_recorder
 import pytest
+from antlr4 import ParseTreeWalker
 from asyncpg import Record
 from asyncpg.connection import Connection
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 from pytest_approval import verify
 
+from ohsome_filter_to_sql import OhsomeFilter, validation
 from ohsome_filter_to_sql.main import (
+    CompiledFilter,
+    InvalidRangeError,
     LexerValueError,
+    OFLToSql,
     ParserValueError,
+    Translator,
+    TreeBuilder,
     build_tree,
+    cache_clear,
+    cache_info,
+    compile_filter,
+    handlers,
     ohsome_filter_to_sql,
+    ohsome_filter_to_sql_many,
+    parse_info,
+    parse_info_clear,
+    set_cache_size,
     unescape,
+    validate_filter,
+    walk_tree,
 )
+from ohsome_filter_to_sql.OFLParser import OFLParser
 
 pytestmark = pytest.mark.asyncio  # mark all tests
 
@@ -721,3 +741,316 @@ async def test_args_shift_invalid_negative_shift():
     filter_ = "(landuse=forest or natural=wood) and geometry:polygon"
     with pytest.raises(ValidationError):
         ohsome_filter_to_sql(filter_, args_shift=-1)
+
+
+async def test_args_shift_converted():
+    """Arguments which are not of the expected type are converted by pydantic."""
+    assert ohsome_filter_to_sql("natural=tree", args_shift="1") == (  # ty: ignore[invalid-argument-type]
+        "tags @> $2",
+        ('{"natural": "tree"}',),
+    )
+
+
+async def test_validation_skipped(monkeypatch):
+    """Valid arguments of the expected type are not validated by pydantic."""
+    monkeypatch.setattr(validation, "ohsome_filter_to_sql", None)
+    expected = ("tags @> $2", ('{"natural": "tree"}',))
+    assert ohsome_filter_to_sql("natural=tree", args_shift=1) == expected
+    assert Translator().translate("natural=tree", args_shift=1) == expected
+
+
+@pytest.fixture
+def cache():
+    cache_clear()
+    yield
+    set_cache_size(1024)
+    cache_clear()
+
+
+async def test_cache(cache):
+    filter_ = "highway in (residential, living_street) and id:(1, 2)"
+    query_1, query_args_1 = ohsome_filter_to_sql(filter_)
+    query_2, query_args_2 = ohsome_filter_to_sql(filter_)
+    assert query_1 is query_2
+    assert query_args_1 is query_args_2
+    assert cache_info().hits == 1
+    assert cache_info().misses == 1
+    # cached results are immutable all the way down
+    assert isinstance(query_args_1, tuple)
+    assert all(isinstance(a, (str, int, float, tuple)) for a in query_args_1)
+
+
+async def test_cache_args_shift(cache):
+    filter_ = "natural=tree"
+    assert ohsome_filter_to_sql(filter_) == ("tags @> $1", ('{"natural": "tree"}',))
+    assert ohsome_filter_to_sql(filter_, args_shift=1) == (
+        "tags @> $2",
+        ('{"natural": "tree"}',),
+    )
+    assert cache_info().misses == 2
+    assert cache_info().currsize == 2
+
+
+async def test_cache_eviction(cache):
+    set_cache_size(2)
+    ohsome_filter_to_sql("natural=tree")
+    ohsome_filter_to_sql("natural=wood")
+    ohsome_filter_to_sql("natural=tree")  # most recently used
+    ohsome_filter_to_sql("natural=water")  # evicts natural=wood
+    info = cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+    ohsome_filter_to_sql("natural=tree")
+    assert cache_info().hits == 2
+    ohsome_filter_to_sql("natural=wood")
+    assert cache_info().misses == 4
+
+
+async def test_cache_disabled(cache):
+    set_cache_size(0)
+    ohsome_filter_to_sql("natural=tree")
+    ohsome_filter_to_sql("natural=tree")
+    assert cache_info().hits == 0
+    assert cache_info().currsize == 0
+
+
+async def test_set_cache_size_invalid():
+    with pytest.raises(ValidationError):
+        set_cache_size(-1)
+
+
+@pytest.fixture
+def parse_counts(cache):
+    """Count parses from zero, with no translation cached by earlier tests."""
+    parse_info_clear()
+    yield
+    parse_info_clear()
+
+
+async def test_parse_info(parse_counts):
+    build_tree("(landuse=forest or natural=wood) and geometry:polygon")
+    assert parse_info() == (1, 0)
+
+
+async def test_parse_info_fallback(parse_counts):
+    with pytest.raises(ParserValueError, match="line 1:16 mismatched input"):
+        build_tree("natural=tree and")
+    with pytest.raises(LexerValueError):
+        build_tree("natural=tree!")
+    assert parse_info() == (0, 2)
+
+
+async def test_validate_filter(parse_counts):
+    filter_ = "(landuse=forest or natural=wood) and geometry:polygon"
+    compiled = validate_filter(filter_)
+    assert isinstance(compiled, CompiledFilter)
+    assert compiled == filter_
+    assert ohsome_filter_to_sql(compiled) == ohsome_filter_to_sql(filter_)
+    assert ohsome_filter_to_sql(compiled, args_shift=2) == ohsome_filter_to_sql(
+        filter_, args_shift=2
+    )
+    assert parse_info().sll == 3  # compiled filter is not parsed again
+
+
+async def test_validate_filter_invalid():
+    with pytest.raises(ParserValueError):
+        validate_filter("natural=tree and")
+
+
+async def test_ohsome_filter_model(parse_counts):
+    class Request(BaseModel):
+        filter: OhsomeFilter
+
+    # not a trivial filter, which would be translated without the parser
+    request = Request(filter="natural=tree or type:way")
+    assert isinstance(request.filter, CompiledFilter)
+    assert request.model_dump() == {"filter": "natural=tree or type:way"}
+    assert ohsome_filter_to_sql(request.filter) == (
+        "tags @> $1 OR osm_type = $2",
+        ('{"natural": "tree"}', "way"),
+    )
+    assert parse_info().sll == 1
+
+
+@pytest.mark.parametrize("filter_", ("*", "natural=tree", "id:(1..5) or a in (b, c)"))
+async def test_compiled_filter_pickle(filter_):
+    compiled = compile_filter(filter_)
+    unpickled = pickle.loads(pickle.dumps(compiled))  # noqa: S301
+    assert unpickled == compiled
+    assert unpickled.to_sql(1) == compiled.to_sql(1)
+
+
+@pytest.mark.parametrize(
+    "filter_, engine", ((None, "antlr"), ("", "antlr"), ("natural=tree", "foo"))
+)
+async def test_compile_filter_invalid_args(filter_, engine):
+    with pytest.raises(ValidationError):
+        compile_filter(filter_, engine=engine)
+
+
+async def test_invalid_range_error_pickle():
+    error = InvalidRangeError(10, 1)
+    unpickled = pickle.loads(pickle.dumps(error))  # noqa: S301
+    assert str(unpickled) == str(error)
+    assert (unpickled.lower_bound, unpickled.upper_bound) == (10, 1)
+
+
+async def test_ohsome_filter_to_sql_many():
+    filters = [
+        "natural=tree",
+        "natural=tree and",
+        validate_filter("type:way"),
+        "area:(10..1)",
+        "*",
+        "natural=tree!",
+        "id:(1, 2)",
+        "id:(0..0) and a=b",
+        "natural=tree",
+    ]
+    results = ohsome_filter_to_sql_many(filters, args_shift=1)
+    assert results[0] == ("tags @> $2", ('{"natural": "tree"}',))
+    assert isinstance(results[1], ParserValueError)
+    assert results[2] == ("osm_type = $2", ("way",))
+    assert isinstance(results[3], InvalidRangeError)
+    assert results[4] == ("1=1", ())
+    assert isinstance(results[5], LexerValueError)
+    assert results[6] == ("osm_id = ANY($2)", ((1, 2),))
+    # the error of a filter without SQL of its range does not fail the batch
+    assert isinstance(results[7], IndexError)
+    assert results[8] == results[0]
+
+
+async def test_ohsome_filter_to_sql_many_invalid_filters():
+    """Filters of other types or empty filters fail like in ohsome_filter_to_sql."""
+    filters = [None, "", 1, "natural=tree"]
+    results = ohsome_filter_to_sql_many(filters)  # ty: ignore[invalid-argument-type]
+    for filter_, result in zip(filters[:3], results, strict=False):
+        assert isinstance(result, ValidationError)
+        with pytest.raises(ValidationError):
+            ohsome_filter_to_sql(filter_)  # ty: ignore[invalid-argument-type]
+    assert results[3] == ("tags @> $1", ('{"natural": "tree"}',))
+
+
+async def test_ohsome_filter_to_sql_many_invalid_args_shift():
+    with pytest.raises(ValidationError):
+        ohsome_filter_to_sql_many(["natural=tree"], args_shift=-1)
+
+
+async def test_translator():
+    translator = Translator(engine="descent")
+    assert translator.translate("natural=tree", args_shift=1) == (
+        "tags @> $2",
+        ('{"natural": "tree"}',),
+    )
+    assert translator.translate("natural=tree", args_shift=1) == (
+        "tags @> $2",
+        ('{"natural": "tree"}',),
+    )
+    assert translator.cache.info().hits == 1
+    # each translator has its own cache unless one is given
+    assert translator.cache is not Translator().cache
+
+
+async def test_translator_reuse():
+    """A translator reuses its listener without mixing up query arguments."""
+    translator = Translator()
+    with pytest.raises(InvalidRangeError):
+        translator.translate("natural=tree and area:(10..1)")
+    assert translator.compile("id:(1, 2)").to_sql() == (
+        "osm_id = ANY($1)",
+        ((1, 2),),
+    )
+    assert translator.translate_many(["type:way", "natural=tree and"])[0] == (
+        "osm_type = $1",
+        ("way",),
+    )
+
+
+async def test_translator_invalid():
+    with pytest.raises(ValidationError):
+        Translator().translate("")
+    with pytest.raises(ValidationError):
+        Translator().translate_many(["natural=tree"], args_shift=-1)
+
+
+@pytest.mark.parametrize("engine", ("antlr", "descent"))
+async def test_translator_threads(engine):
+    """Each thread translates with its own lexer, parser and listener."""
+    filters = [
+        f"natural=tree{i} and id:({i}, {i + 1}) or a in (b, c)" for i in range(200)
+    ]
+    expected = [ohsome_filter_to_sql(filter_) for filter_ in filters]
+    translator = Translator(engine=engine)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(translator.compile, filters))
+    assert [result.to_sql() for result in results] == expected
+
+
+@pytest.mark.parametrize(
+    "filter_",
+    (
+        "natural=tree",
+        "not (a=b or c=d) and e in (f, g) and id:(1..5)",
+        "a=b and c=d or not e=f and ( type:way or geometry:polygon )",
+        "key~*foo* and area:(1.5..) or changeset:(1, 2)",
+    ),
+)
+async def test_walk_tree(filter_):
+    """The iterative walker notifies the listener like ParseTreeWalker."""
+    tree = build_tree(filter_)
+    expected = OFLToSql()
+    ParseTreeWalker().walk(expected, tree)
+    listener = walk_tree(tree, OFLToSql())
+    assert listener.expressions() == expected.expressions()
+
+
+async def test_handlers():
+    """The dispatch table holds only the methods OFLToSql implements."""
+    table = handlers(OFLToSql)
+    assert OFLParser.RootContext not in table
+    assert table[OFLParser.ExpressionContext] == (
+        OFLToSql.enterExpression,
+        OFLToSql.exitExpression,
+    )
+    assert table[OFLParser.AndContext] == (None, OFLToSql.exitAnd)
+    assert OFLParser.EqContext not in table
+    assert table[OFLParser.TagListMatchContext] == (
+        OFLToSql.enterTagListMatch,
+        OFLToSql.exitTagListMatch,
+    )
+
+
+async def test_translate_without_parse_tree():
+    """A builder translating while parsing is reused after errors and for trees."""
+    builder = TreeBuilder()
+    listener = OFLToSql()
+    with pytest.raises(ParserValueError):
+        builder.translate("(a=b or c in (d, e)) and", listener)
+    listener.reset()
+    expected = walk_tree(build_tree("not (a=b or c in (d, e))"), OFLToSql())
+    listener = builder.translate("not (a=b or c in (d, e))", listener)
+    assert listener.expressions() == expected.expressions()
+    assert builder.build_tree("a=b").getChildCount() == 2  # expression and EOF
+
+
+async def test_translate_listener_error():
+    """Errors of the listener are raised, not hidden by parsing again in LL mode."""
+
+    class BrokenListener(OFLToSql):
+        def exitTagMatch(self, ctx):  # noqa: N802
+            raise RuntimeError("broken")
+
+    builder = TreeBuilder()
+    parse_info_clear()
+    with pytest.raises(RuntimeError, match="broken"):
+        builder.translate("a=b", BrokenListener())
+    assert parse_info().ll == 0
+    assert builder.translate("a=b", OFLToSql()).expressions()
+
+
+async def test_walk_tree_many_terms():
+    """Parse trees of long OR chains are deeper than the recursion limit."""
+    filter_ = " or ".join(f"key{i}=value" for i in range(10_000))
+    query, query_args = ohsome_filter_to_sql(filter_)
+    assert query.count(" OR ") == 9_999
+    assert query_args[-1] == '{"key9999": "value"}'
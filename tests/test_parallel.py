@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+from ohsome_filter_to_sql.dfa import dump_dfa
+from ohsome_filter_to_sql.main import InvalidRangeError, ohsome_filter_to_sql_many
+from ohsome_filter_to_sql.parallel import ohsome_filter_to_sql_parallel
+from tests.test_descent import EDGE_CASES, approved_filters
+
+
+def comparable(results: list) -> list:
+    return [
+        result if isinstance(result, tuple) else (type(result), str(result))
+        for result in results
+    ]
+
+
+@pytest.mark.parametrize("engine", ("antlr", "descent"))
+def test_ohsome_filter_to_sql_parallel(engine):
+    """Results of all chunks are returned in order, errors in place of results."""
+    filters = approved_filters() + list(EDGE_CASES)
+    expected = ohsome_filter_to_sql_many(filters, args_shift=2, engine=engine)
+    results = ohsome_filter_to_sql_parallel(
+        filters, args_shift=2, engine=engine, max_workers=2, chunksize=7
+    )
+    assert comparable(results) == comparable(expected)
+
+
+def test_ohsome_filter_to_sql_parallel_dfa_cache(tmp_path):
+    path = tmp_path / "dfa.pickle"
+    dump_dfa(path)
+    results = ohsome_filter_to_sql_parallel(
+        ["natural=tree", "id:(10..1)"], max_workers=1, dfa_cache=path
+    )
+    assert results[0] == ("tags @> $1", ('{"natural": "tree"}',))
+    assert isinstance(results[1], InvalidRangeError)
+    assert str(results[1]).endswith("Try swapping bounds: (1..10)")
+
+
+def test_ohsome_filter_to_sql_parallel_empty():
+    assert ohsome_filter_to_sql_parallel([], max_workers=1) == []
+
+
+@pytest.mark.skipif(sys.version_info < (3, 14), reason="requires Python 3.14")
+def test_ohsome_filter_to_sql_parallel_interpreter():
+    filters = ["natural=tree", "natural=tree and", "type:way"]
+    results = ohsome_filter_to_sql_parallel(filters, pool="interpreter", max_workers=2)
+    assert comparable(results) == comparable(ohsome_filter_to_sql_many(filters))
+
+
+def test_worker_in_subinterpreter(tmp_path):
+    """Workers of an interpreter pool can import and run the worker functions."""
+    interpreters = pytest.importorskip("_interpreters")
+    path = tmp_path / "dfa.pickle"
+    dump_dfa(path)
+    code = f"""
+from ohsome_filter_to_sql.parallel import init_worker, translate_chunk
+init_worker({str(path)!r})
+results = translate_chunk(("natural=tree", "natural="), 0, "antlr")
+assert results[0] == ("tags @> $1", ('{{"natural": "tree"}}',)), results
+assert isinstance(results[1], ValueError), results
+"""
+    interpreter = interpreters.create()
+    try:
+        error = interpreters.exec(interpreter, code)
+    finally:
+        interpreters.destroy(interpreter)
+    assert error is None, error.formatted
+
+
+@pytest.mark.skipif(sys.version_info >= (3, 14), reason="requires Python < 3.14")
+def test_ohsome_filter_to_sql_parallel_interpreter_unavailable():
+    with pytest.raises(NotImplementedError):
+        ohsome_filter_to_sql_parallel(["natural=tree"], pool="interpreter")
+
+
+def test_ohsome_filter_to_sql_parallel_invalid_chunksize():
+    with pytest.raises(ValidationError):
+        ohsome_filter_to_sql_parallel(["natural=tree"], chunksize=0)
+
+
+def test_ohsome_filter_to_sql_parallel_invalid_engine():
+    with pytest.raises(ValidationError):
+        ohsome_filter_to_sql_parallel(["natural=tree"], engine="foo")  # ty: ignore[invalid-argument-type]
+
+
+def test_ohsome_filter_to_sql_parallel_converted_args():
+    """Arguments of other types are converted by pydantic."""
+    args = {"args_shift": "1", "max_workers": "1", "chunksize": 1.0}
+    results = ohsome_filter_to_sql_parallel(["id:1"], **args)  # ty: ignore[invalid-argument-type]
+    assert results == [("osm_id = $2", (1,))]
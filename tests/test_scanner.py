@@ -0,0 +1,102 @@
+import pytest
+from antlr4 import InputStream, Token
+from antlr4.error.ErrorListener import ErrorListener
+
+from ohsome_filter_to_sql.main import LexerValueError, build_tree
+from ohsome_filter_to_sql.OFLLexer import OFLLexer
+from ohsome_filter_to_sql.OFLParser import OFLParser
+from ohsome_filter_to_sql.scanner import OFLScanner
+from tests.test_descent import approved_filters
+
+
+class CollectingErrorListener(ErrorListener):
+    def __init__(self):
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):  # noqa: N802, N803
+        self.errors.append((line, column, msg))
+
+
+def tokenize(token_source) -> list[tuple]:
+    tokens = []
+    while True:
+        token = token_source.nextToken()
+        tokens.append(
+            (
+                token.type,
+                token.text,
+                token.channel,
+                token.start,
+                token.stop,
+                token.line,
+                token.column,
+            )
+        )
+        if token.type == Token.EOF:
+            return tokens
+
+
+def lex_antlr(filter_: str) -> tuple[list[tuple], list[tuple]]:
+    listener = CollectingErrorListener()
+    lexer = OFLLexer(InputStream(filter_))
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+    return (tokenize(lexer), listener.errors)
+
+
+def lex_scanner(filter_: str) -> tuple[list[tuple], list[tuple]]:
+    listener = CollectingErrorListener()
+    return (tokenize(OFLScanner(filter_, listener)), listener.errors)
+
+
+EDGE_CASES = (
+    "and andor or_ not- in1",
+    "type id geometry area perimeter length changeset",
+    "geometry.vertices geometry.outers geometry.inners",
+    "geometry.verticesx geometry.outer geometry. geometry",
+    "node way relation nodes node/ node/1 way/12x relation/1.5",
+    "point line polygon collection points",
+    "1 12 1.5 1. 1.e5 1e 1e5 1E5 1e5x 1.5e 1.5e5 1.5e5x 12a a12 1a.5 1e5.5",
+    "1..2 ..2 1.. ... .",
+    '"" "a" "a\\"b" "a\\\\" "a\\n" "a\\r" "a\\x" "a\\" "ab',
+    '"a\nb"',
+    "! != !x = ~ * : ( ) ,",
+    "a\tb\r\nc\n\nd  e",
+    "x # y",
+    "a=b\n!",
+    "é",
+    "\n\t",
+)
+
+
+@pytest.mark.parametrize("filter_", approved_filters() + list(EDGE_CASES))
+def test_scanner_parity(filter_):
+    assert lex_scanner(filter_) == lex_antlr(filter_)
+
+
+@pytest.mark.parametrize("filter_", approved_filters() + list(EDGE_CASES))
+def test_scanner_scan(filter_):
+    tokens, errors = lex_scanner(filter_)
+    listener = CollectingErrorListener()
+    types, texts = OFLScanner(filter_, listener).scan()
+    assert types == [token[0] for token in tokens[:-1]]
+    assert texts == [token[1] for token in tokens[:-1]]
+    assert listener.errors == errors
+
+
+@pytest.mark.parametrize(
+    "filter_",
+    ("(landuse=forest or natural=wood) and geometry:polygon", "id:(1, 2, 3)"),
+)
+def test_build_tree_lexer(filter_):
+    tree = build_tree(filter_)
+    expected = build_tree(filter_, lexer="antlr")
+    names = OFLParser.ruleNames
+    assert tree.toStringTree(ruleNames=names) == expected.toStringTree(ruleNames=names)
+
+
+def test_build_tree_lexer_error():
+    with pytest.raises(
+        LexerValueError, match="line 2:4 token recognition error at: '!x'"
+    ):
+        build_tree("a=b\nand !x")
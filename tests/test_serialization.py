@@ -0,0 +1,103 @@
+import pytest
+
+from ohsome_filter_to_sql import ir
+from ohsome_filter_to_sql.main import CompiledFilter, compile_filter
+from ohsome_filter_to_sql.serialization import (
+    MAGIC,
+    NODES,
+    VERSION,
+    dump_filter,
+    load_filter,
+)
+from ohsome_filter_to_sql.sql import to_sql
+from tests.test_descent import approved_filters
+
+
+def compiled_filters() -> list[CompiledFilter]:
+    compiled = []
+    for filter_ in approved_filters():
+        try:
+            compiled.append(compile_filter(filter_))
+        except Exception:  # noqa: S112
+            continue
+    return compiled
+
+
+@pytest.mark.parametrize("compiled", compiled_filters(), ids=str)
+def test_dump_load(compiled):
+    loaded = load_filter(dump_filter(compiled))
+    assert type(loaded) is CompiledFilter
+    assert loaded == compiled
+    assert loaded.to_sql(1) == compiled.to_sql(1)
+    assert loaded.expressions == compiled.expressions
+
+
+def test_dump_load_nested():
+    depth = 1000
+    compiled = compile_filter("(" * depth + "a=b" + ")" * depth)
+    data = dump_filter(compiled)
+    loaded = load_filter(data)
+    assert loaded.to_sql() == compiled.to_sql()
+    assert dump_filter(loaded) == data
+
+
+def test_load_shared():
+    compiled = compile_filter("building=* and geometry:polygon")
+    loaded = load_filter(dump_filter(compiled))
+    assert loaded.expressions[0] is compiled.expressions[0]
+
+
+def test_load_without_parsing():
+    # the SQL is translated from the expressions and not by parsing the filter again
+    expressions = (ir.TagEq("a", "b"),)
+    compiled = CompiledFilter("x=y", "tags @> $1", ('{"x": "y"}',), expressions)
+    loaded = load_filter(dump_filter(compiled))
+    assert loaded == "x=y"
+    assert loaded.to_sql() == ("tags @> $1", ('{"a": "b"}',))
+    assert loaded.expressions == expressions
+
+
+def test_load_sql_from_expressions():
+    # SQL of the dumped filter is not stored and cannot be injected
+    expressions = (ir.TagEq("a", "b"),)
+    compiled = CompiledFilter("a=b", "true; DROP TABLE x", (), expressions)
+    assert load_filter(dump_filter(compiled)).to_sql() == to_sql(expressions)
+
+
+def test_load_verbatim():
+    compiled = CompiledFilter("a=b", "true", (), (ir.Verbatim("true"),))
+    with pytest.raises(ValueError):
+        load_filter(dump_filter(compiled))
+
+
+def test_dump_compact():
+    compiled = compile_filter("natural=tree and geometry:polygon and area:(1.5..)")
+    data = dump_filter(compiled)
+    assert data.startswith(MAGIC + bytes((VERSION,)))
+    assert len(data) < 2 * (len(compiled) + len(compiled.query))
+
+
+def test_nodes():
+    assert set(NODES) == set(ir.Expression.__value__.__args__)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"SQL",
+        MAGIC,
+        MAGIC + bytes((VERSION + 1,)),
+        MAGIC + bytes((VERSION,)),
+        MAGIC + bytes((VERSION, 5, 10)) + b"a",  # truncated str
+        MAGIC + bytes((VERSION, 6, 2)),  # tuple of missing values
+        MAGIC + bytes((VERSION, 7)),  # unknown tag
+        MAGIC + bytes((VERSION, 3, 0x80)),  # truncated int
+        MAGIC + bytes((VERSION, 0, 0)),  # two values
+        MAGIC + bytes((VERSION, 5, 1)) + b"a",  # a str only
+        MAGIC + bytes((VERSION, 5, 1)) + b"a" + bytes((0, 6, 1, 6, 2)),  # not a node
+    ],
+)
+def test_load_invalid(data):
+    with pytest.raises(ValueError):
+        load_filter(data)
@@ -0,0 +1,154 @@
+import gc
+import pickle
+import tracemalloc
+import weakref
+
+import pytest
+
+from ohsome_filter_to_sql import ir
+from ohsome_filter_to_sql.main import (
+    InvalidRangeError,
+    OFLToSql,
+    UnsupportedClauseError,
+    build_tree,
+    compile_filter,
+    walk_tree,
+)
+from ohsome_filter_to_sql.sql import containment, to_sql
+
+
+@pytest.mark.parametrize("engine", ["antlr", "descent"])
+def test_expressions(engine):
+    compiled = compile_filter("(a=b or c=*) and not id:(1..)", engine)
+    assert compiled.expressions == (
+        ir.And(
+            (
+                ir.Group(ir.Or((ir.TagEq("a", "b"), ir.TagExists("c")))),
+                ir.Not(ir.IdRange(1, None)),
+            )
+        ),
+    )
+
+
+@pytest.mark.parametrize("engine", ["antlr", "descent"])
+def test_expressions_flattened(engine):
+    a, b, c = ir.TagEq("a", "1"), ir.TagEq("b", "2"), ir.TagEq("c", "3")
+    cases = {
+        "a=1 or b=2 or c=3": ir.Or((a, b, c)),
+        "a=1 and b=2 or c=3": ir.Or((ir.And((a, b)), c)),
+        "a=1 or b=2 and c=3": ir.Or((a, ir.And((b, c)))),
+        "a=1 or (b=2 or c=3)": ir.Or((a, ir.Group(ir.Or((b, c))))),
+        "not a=1 and b=2 and c=3": ir.And((ir.Not(a), b, c)),
+    }
+    for filter_, expected in cases.items():
+        assert compile_filter(filter_, engine).expressions == (expected,)
+
+
+def test_expressions_flattened_many_terms():
+    filter_ = " or ".join(f"key{i}=value" for i in range(5_000))
+    (expression,) = compile_filter(filter_, "descent").expressions
+    assert isinstance(expression, ir.Or)
+    assert len(expression.operands) == 5_000
+    assert expression.operands[-1] == ir.TagEq("key4999", "value")
+
+
+@pytest.mark.parametrize("engine", ["antlr", "descent"])
+def test_expressions_shared(engine):
+    (first,) = compile_filter("(a=b or c=d) and type:way", engine).expressions
+    (second,) = compile_filter("type:way and not (a=b or c=d)", engine).expressions
+    assert isinstance(first, ir.And)
+    assert isinstance(second, ir.And)
+    assert second.operands[0] is first.operands[1]
+    negation = second.operands[1]
+    assert isinstance(negation, ir.Not)
+    assert negation.expression is first.operands[0]
+    assert hash(second.operands[0]) == hash(ir.TypeEq("way"))
+
+
+def test_intern():
+    node = ir.And(
+        (ir.intern(ir.TagEq("test_intern", "b")), ir.intern(ir.TagExists("c")))
+    )
+    assert node == ir.And((ir.TagEq("test_intern", "b"), ir.TagExists("c")))
+    assert node != ir.Or((ir.TagEq("test_intern", "b"), ir.TagExists("c")))
+    assert ir.intern(node) is node
+    assert ir.intern(ir.And((ir.TagEq("test_intern", "b"), ir.TagExists("c")))) is node
+
+
+@pytest.mark.parametrize("engine", ["antlr", "descent"])
+def test_strings_shared(engine):
+    (first,) = compile_filter("highway=primary", engine).expressions
+    (second,) = compile_filter(
+        '"highway" in (primary, "secondary")', engine
+    ).expressions
+    assert isinstance(first, ir.TagEq)
+    assert isinstance(second, ir.TagIn)
+    assert second.key is first.key
+    assert second.values[0] is first.value
+
+
+def test_containment_shared():
+    _, first = compile_filter("building=yes").to_sql()
+    _, second = compile_filter("type:way and building!=yes").to_sql()
+    assert first == ('{"building": "yes"}',)
+    assert second[1] is first[0]
+    assert containment("building", "yes") is first[0]
+
+
+def test_intern_weak():
+    """Nodes which are not referenced anymore are dropped."""
+    node = weakref.ref(ir.intern(ir.TagEq("test_intern_weak", "b")))
+    gc.collect()
+    assert node() is None
+
+
+def test_expressions_slots():
+    expression = ir.TagEq("a", "b")
+    assert not hasattr(expression, "__dict__")
+    with pytest.raises(AttributeError):
+        expression.key = "c"  # type: ignore
+
+
+def test_expressions_pickle():
+    compiled = compile_filter("a=b and type:way")
+    unpickled = pickle.loads(pickle.dumps(compiled))  # noqa: S301
+    assert unpickled.expressions == compiled.expressions
+
+
+def test_to_sql_args_shift():
+    expressions = (ir.And((ir.TagEq("a", "b"), ir.IdIn((1, 2)))),)
+    assert to_sql(expressions, args_shift=2) == (
+        "tags @> $3 AND osm_id = ANY($4)",
+        ('{"a": "b"}', (1, 2)),
+    )
+
+
+def test_to_sql_invalid_range():
+    # bounds of ranges are checked when SQL is emitted
+    with pytest.raises(InvalidRangeError):
+        to_sql((ir.IdRange(2, 1),))
+
+
+def test_to_sql_unsupported():
+    with pytest.raises(UnsupportedClauseError) as error:
+        to_sql((ir.Unsupported("geometry.vertices:(1..2)"),))
+    assert str(error.value) == "Clause is not supported yet: geometry.vertices:(1..2)"
+    assert pickle.loads(pickle.dumps(error.value)).args == error.value.args  # noqa: S301
+
+
+def allocated(function) -> int:
+    tracemalloc.start()
+    try:
+        result = function()  # noqa: F841 keep result alive while measuring
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_expressions_memory():
+    filter_ = " or ".join(f"key{i}=value{i}" for i in range(1_000))
+    tree = allocated(lambda: build_tree(filter_))
+    tree_ = build_tree(filter_)
+    expressions = allocated(lambda: walk_tree(tree_, OFLToSql()).expressions())
+    # including new entries of the tables of shared nodes, keys and values
+    assert expressions < tree / 2
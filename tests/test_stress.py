@@ -0,0 +1,44 @@
+import sys
+import time
+
+import pytest
+
+from ohsome_filter_to_sql.main import Engine, compile_filter
+
+
+def many_terms(n: int) -> str:
+    return " or ".join(f"key{i}=value and not id:{i}" for i in range(n))
+
+
+def deeply_nested(depth: int) -> str:
+    return "(not " * depth + "key=value" + ")" * depth
+
+
+def duration(filter_: str, engine: Engine) -> float:
+    start = time.perf_counter()
+    compile_filter(filter_, engine)
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize("engine", ("antlr", "descent"))
+def test_many_terms(engine):
+    query = compile_filter(many_terms(10_000), engine).query
+    assert query.count(" OR ") == 9_999
+    assert query.endswith("tags @> $19999 AND NOT osm_id = $20000")
+
+
+@pytest.mark.parametrize("engine", ("antlr", "descent"))
+def test_deeply_nested(engine):
+    limit = sys.getrecursionlimit()
+    query = compile_filter(deeply_nested(1_000), engine).query
+    assert query == "(NOT " * 1_000 + "tags @> $1" + ")" * 1_000
+    assert sys.getrecursionlimit() == limit
+
+
+@pytest.mark.parametrize("engine", ("antlr", "descent"))
+@pytest.mark.parametrize("build", (many_terms, deeply_nested))
+def test_linear_time(engine, build):
+    """Four times the terms or depth take far less than 16 times as long."""
+    small = min(duration(build(250), engine) for _ in range(3))
+    large = min(duration(build(1_000), engine) for _ in range(3))
+    assert large < small * 10
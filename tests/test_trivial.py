@@ -0,0 +1,82 @@
+import pytest
+
+from ohsome_filter_to_sql.main import OFLToSql, compile_filter
+from ohsome_filter_to_sql.sql import to_sql
+from ohsome_filter_to_sql.trivial import translate_trivial
+from tests.test_descent import EDGE_CASES, approved_filters, translate
+
+TRIVIAL = (
+    "natural=tree",
+    "building=*",
+    "type:way",
+    "geometry:polygon",
+    "natural=tree and type:node",
+    "building=* and geometry:polygon and type:way",
+    "addr:street=Main-Street_1",
+    "lanes=2",
+    "highway = primary\tand\ntype : way",
+    "building=point",
+    "node=way",
+)
+
+NOT_TRIVIAL = (
+    "natural=tree or type:node",
+    "(natural=tree)",
+    "not natural=tree",
+    "natural!=tree",
+    'name="Bar and Grill"',
+    "natural=tree and",
+    "natural=tree AND type:node",
+    "height=1.5",
+    "height=1e5",
+    "a:=b",
+    "a:1=b",
+    "type=node",
+    "id:1",
+    "type:nodes",
+    "geometry:points",
+    "name:in=b",
+)
+
+
+def translate_with_fast_path(filter_: str) -> tuple | None:
+    listener = OFLToSql()
+    if not translate_trivial(filter_, listener):
+        assert not listener.stack
+        return None
+    expressions = listener.expressions()
+    return (expressions, to_sql(expressions))
+
+
+@pytest.mark.parametrize(
+    "filter_", approved_filters() + list(EDGE_CASES) + list(TRIVIAL)
+)
+def test_trivial_parity(filter_):
+    """Trivial filters are translated as by the parser, others are left to it."""
+    result = translate_with_fast_path(filter_)
+    if result is not None:
+        assert result == translate(filter_, "stream")
+
+
+@pytest.mark.parametrize("filter_", TRIVIAL)
+def test_trivial(filter_):
+    assert translate_with_fast_path(filter_) is not None
+
+
+@pytest.mark.parametrize("filter_", NOT_TRIVIAL)
+def test_not_trivial(filter_):
+    assert translate_with_fast_path(filter_) is None
+
+
+def test_trivial_approved_filters():
+    trivial = [f for f in approved_filters() if translate_with_fast_path(f)]
+    assert len(trivial) > 10
+
+
+def test_trivial_compile_filter():
+    compiled = compile_filter("natural=tree and type:way")
+    assert compiled.to_sql() == (
+        "tags @> $1 AND osm_type = $2",
+        ('{"natural": "tree"}', "way"),
+    )
+    assert compiled.expressions == translate("natural=tree and type:way", "antlr")[0]